@@ -1,7 +1,3 @@
-import subprocess
-import sys
-import os
-
 bl_info = {
     "name": "Neural Render",
     "author": "Alex Nix",
@@ -16,43 +12,36 @@ bl_info = {
 }
 
 import bpy
-from .operator import ReplicateImageToImageOperator
-from .panel import ReplicateImageToImagePanel, UpscaleImagePanel, UpscaleRenderResultPanel, OpenLastRenderOperator
-from .preferences import ReplicateAddonPreferences
+from .operator import ReplicateImageToImageOperator, ReplicateFrameRangeOperator, CancelJobsOperator, ShowResultOperator, ClearResultsOperator
+from .panel import ReplicateImageToImagePanel, NeuralRenderPerformancePanel, NeuralRenderResultsPanel, ResultViewerPanel, UpscaleImagePanel, UpscaleRenderResultPanel, OpenLastRenderOperator
+from .preferences import ReplicateAddonPreferences, InstallDependenciesOperator
 from .models import available_models
+from .jobs import shutdown_executor
+from . import clients
+from . import properties
+from . import autoprocess
+from . import gallery
+from .utils import register_handlers, unregister_handlers, enable_timing_log, apply_model_limit
 
 classes = (
     ReplicateAddonPreferences,
+    InstallDependenciesOperator,
     ReplicateImageToImageOperator,
+    ReplicateFrameRangeOperator,
+    CancelJobsOperator,
+    ShowResultOperator,
+    ClearResultsOperator,
     ReplicateImageToImagePanel,
+    NeuralRenderPerformancePanel,
+    NeuralRenderResultsPanel,
+    ResultViewerPanel,
     UpscaleImagePanel,
     UpscaleRenderResultPanel,
     OpenLastRenderOperator,
 )
 
-def check_and_install_dependencies():
-    required_packages = ['replicate', 'requests']
-    
-    # Get Blender's Python executable path
-    python_exe = sys.executable
-    
-    for package in required_packages:
-        try:
-            __import__(package)
-        except ImportError:
-            print(f"{package} not found. Attempting to install...")
-            try:
-                subprocess.check_call([python_exe, "-m", "pip", "install", package])
-                print(f"Successfully installed {package}")
-            except subprocess.CalledProcessError:
-                print(f"Failed to install {package}. Please install it manually.")
-                return False
-    return True
-
 def register():
-    if not check_and_install_dependencies():
-        raise ImportError("Required dependencies are not installed. Please install them manually.")
-
+    # Only bpy and model metadata are touched here; network libraries are imported when a job first runs
     for cls in classes:
         try:
             bpy.utils.register_class(cls)
@@ -71,44 +60,12 @@ def register():
         description="Select the AI model to use"
     )
 
-    for model in available_models:
-        for param in model.parameters:
-            if param.name not in ["control_image", "mask"]:  # Skip both control_image and mask parameters
-                if param.type == "int":
-                    setattr(bpy.types.Scene, f"replicate_{param.name}", bpy.props.IntProperty(
-                        name=param.name.replace("_", " ").title(),
-                        default=param.default,
-                        description=param.description,
-                        min=int(param.min) if param.min is not None else -2**31,
-                        max=int(param.max) if param.max is not None else 2**31 - 1
-                    ))
-                elif param.type == "float":
-                    setattr(bpy.types.Scene, f"replicate_{param.name}", bpy.props.FloatProperty(
-                        name=param.name.replace("_", " ").title(),
-                        default=param.default,
-                        description=param.description,
-                        min=param.min if param.min is not None else -float('inf'),
-                        max=param.max if param.max is not None else float('inf')
-                    ))
-                elif param.type == "bool":
-                    setattr(bpy.types.Scene, f"replicate_{param.name}", bpy.props.BoolProperty(
-                        name=param.name.replace("_", " ").title(),
-                        default=param.default,
-                        description=param.description
-                    ))
-                elif param.type == "enum":
-                    setattr(bpy.types.Scene, f"replicate_{param.name}", bpy.props.EnumProperty(
-                        name=param.name.replace("_", " ").title(),
-                        items=[(option, option, "") for option in param.options],
-                        default=param.default,
-                        description=param.description
-                    ))
-                else:  # string
-                    setattr(bpy.types.Scene, f"replicate_{param.name}", bpy.props.StringProperty(
-                        name=param.name.replace("_", " ").title(),
-                        default=param.default,
-                        description=param.description
-                    ))
+    properties.register()
+    register_handlers()
+    autoprocess.register()
+    gallery.register()
+    enable_timing_log()
+    apply_model_limit()
 
     bpy.types.Scene.replicate_return_preprocessed_image = bpy.props.BoolProperty(
         name="Return Preprocessed Image",
@@ -116,11 +73,64 @@ def register():
         default=False
     )
 
-    bpy.types.Scene.replicate_seed = bpy.props.IntProperty(
-        name="Seed",
-        default=0,
-        description="Seed for random number generator, 0 means random"
+    bpy.types.Scene.replicate_progressive_preview = bpy.props.BoolProperty(
+        name="Progressive Preview",
+        description="Show a fast low-resolution result with fewer steps first, then replace it with the full-quality result. The full job is cancelled if the parameters change while it runs",
+        default=False
+    )
+
+    bpy.types.Scene.replicate_auto_process = bpy.props.BoolProperty(
+        name="Auto Process Renders",
+        description="Process every finished render with the selected model, unless it and the parameters are unchanged since the last one",
+        default=False
     )
+
+    bpy.types.Scene.replicate_skip_duplicate_frames = bpy.props.BoolProperty(
+        name="Skip Duplicate Frames",
+        description="When processing a frame range, run one prediction per group of near-identical frames with a fixed seed and reuse its output for the whole group",
+        default=False
+    )
+
+    bpy.types.Scene.replicate_duplicate_threshold = bpy.props.IntProperty(
+        name="Duplicate Threshold",
+        description="How many of the 256 perceptual hash bits may differ for two frames to count as duplicates",
+        default=6,
+        min=0,
+        max=64
+    )
+
+    bpy.types.Scene.replicate_control_source = bpy.props.EnumProperty(
+        name="Control Source",
+        items=[
+            ('RENDER', "Render", "Send the render and let the model estimate its control map"),
+            ('DEPTH', "Depth Pass", "Make an exact depth map from the Z pass"),
+            ('MIST', "Mist Pass", "Make a depth map from the Mist pass, using the scene's mist settings for its range"),
+            ('EDGES', "Edges", "Detect soft edges in the render locally"),
+        ],
+        default='RENDER',
+        description="Where the control image comes from for control net models"
+    )
+
+    bpy.types.Scene.replicate_tiled_processing = bpy.props.BoolProperty(
+        name="Tiled Processing",
+        description="Split large images into overlapping tiles, process them concurrently and blend them back together",
+        default=False
+    )
+    bpy.types.Scene.replicate_tile_size = bpy.props.IntProperty(
+        name="Tile Size",
+        default=1024,
+        min=256,
+        max=4096,
+        description="Size of each tile in pixels"
+    )
+    bpy.types.Scene.replicate_tile_overlap = bpy.props.IntProperty(
+        name="Tile Overlap",
+        default=64,
+        min=0,
+        max=512,
+        description="Overlap between neighbouring tiles in pixels, feathered to hide seams"
+    )
+
     bpy.types.Scene.upscale_scale_factor = bpy.props.FloatProperty(
         name="Scale Factor",
         default=2.0,
@@ -179,6 +189,12 @@ def register():
     )
 
 def unregister():
+    gallery.unregister()
+    autoprocess.unregister()
+    unregister_handlers()
+    shutdown_executor()
+    clients.close()
+
     for cls in reversed(classes):
         try:
             bpy.utils.unregister_class(cls)
@@ -186,12 +202,16 @@ def unregister():
             pass  # Class is already unregistered, so we can ignore this error
 
     del bpy.types.Scene.replicate_model
-    for model in available_models:
-        for param in model.parameters:
-            if param.name not in ["control_image", "mask"]:  # Skip both control_image and mask parameters
-                delattr(bpy.types.Scene, f"replicate_{param.name}")
+    properties.unregister()
     del bpy.types.Scene.replicate_return_preprocessed_image
-    del bpy.types.Scene.replicate_seed
+    del bpy.types.Scene.replicate_progressive_preview
+    del bpy.types.Scene.replicate_auto_process
+    del bpy.types.Scene.replicate_control_source
+    del bpy.types.Scene.replicate_skip_duplicate_frames
+    del bpy.types.Scene.replicate_duplicate_threshold
+    del bpy.types.Scene.replicate_tiled_processing
+    del bpy.types.Scene.replicate_tile_size
+    del bpy.types.Scene.replicate_tile_overlap
     del bpy.types.Scene.upscale_scale_factor
     del bpy.types.Scene.upscale_prompt
     del bpy.types.Scene.upscale_negative_prompt
@@ -0,0 +1,144 @@
+import os
+import queue
+import shutil
+
+import bpy
+from bpy.app.handlers import persistent
+
+from .cache import make_key
+from .jobs import Job
+from .operator import needs_api_key, get_selected_model, prepare_input, frame_hash, resolve_output_dir, output_name, frame_output_path
+from .profiling import JobTimings
+from .scheduler import BACKGROUND
+from .properties import build_input_params
+from .utils import get_result_cache, get_job_store, get_job_timeout
+from .dependencies import dependencies_available
+from . import gallery
+from . import profiling
+
+# Opt-in processing of every finished render with the selected model. A render is only sent when its
+# fingerprint (a perceptual hash of the pixels plus the model parameters) differs from the last one sent
+# for the same frame.
+
+# Hash bits that may differ before a render counts as changed; absorbs render noise
+CHANGE_THRESHOLD = 4
+
+TICK_INTERVAL = 0.5
+
+# Render handlers can run on the render thread, so they only queue work; tick() does it on the main thread
+_renders = queue.Queue()
+_last_fingerprints = {}  # (scene name, frame or None) -> (pixel hash, parameter key, output path) of the last render sent
+_jobs = []
+
+def fingerprint(model, input_params, input_data):
+    return frame_hash(input_data), make_key("", model.model_id, input_params)
+
+def unchanged(previous, current):
+    from .perceptual import distance
+
+    return previous is not None and previous[1] == current[1] and distance(previous[0], current[0]) <= CHANGE_THRESHOLD
+
+def _wanted(scene):
+    if bpy.app.background or not scene.replicate_auto_process:
+        return False
+    from .capture import capturing
+
+    return not capturing()  # The operators render their own input and process it themselves
+
+@persistent
+def render_complete_handler(scene, *args):
+    if _wanted(scene):
+        _renders.put((scene.name, None))
+
+@persistent
+def render_write_handler(scene, *args):
+    # Fires for every frame written by an animation render
+    if _wanted(scene):
+        _renders.put((scene.name, scene.frame_current))
+
+def process_render(scene, frame):
+    preferences = bpy.context.preferences.addons[__package__].preferences
+    model = get_selected_model(scene)
+    if needs_api_key(model, preferences.api_key) or not dependencies_available():
+        print("Neural Render: auto processing needs an API key and the required packages")
+        return
+
+    input_params = build_input_params(scene, model)
+    if frame is None:
+        from .capture import capture_image
+
+        input_data = capture_image(bpy.data.images['Render Result'])
+    else:
+        with open(scene.render.frame_path(frame=frame), "rb") as f:
+            input_data = f.read()
+
+    output_dir, name = resolve_output_dir(scene.render.filepath), output_name(scene.render.filepath)
+    output_format = input_params.get("output_format", "png")
+    if frame is None:
+        output_path = os.path.join(output_dir, f"{name}_ai.{output_format}")
+    else:
+        output_path = frame_output_path(output_dir, name, frame, output_format)
+
+    # Each frame is compared with its own last render, so holds in an animation still get their output
+    key = (scene.name, frame)
+    current = fingerprint(model, input_params, input_data)
+    previous = _last_fingerprints.get(key)
+    if unchanged(previous, current):
+        if os.path.exists(output_path) or any(job.output_path == output_path for _, _, job in _jobs):
+            print("Neural Render: render unchanged since the last processed one, skipping")
+            return
+        if os.path.exists(previous[2]):
+            # Same render, new output path: reuse the earlier output rather than paying for it again
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            shutil.copyfile(previous[2], output_path)
+            _last_fingerprints[key] = (*current, output_path)
+            print(f"Neural Render: render unchanged, copied the earlier output to {output_path}")
+            return
+    _last_fingerprints[key] = (*current, output_path)
+
+    timings = JobTimings(model.name)
+    input_data, meta = prepare_input(model, input_params, input_data, preferences.preprocess_inputs, timings)
+    job = Job(preferences.api_key, model, input_params, input_data, output_path, cache=get_result_cache(preferences), meta=meta,
+              store=get_job_store(), timeout=get_job_timeout(preferences), timings=timings, priority=BACKGROUND).submit()
+    _jobs.append((scene.name, frame, job))
+    print(f"Neural Render: processing render with {model.name}...")
+
+def tick():
+    while not _renders.empty():
+        scene_name, frame = _renders.get()
+        scene = bpy.data.scenes.get(scene_name)
+        if scene is None:
+            continue
+        try:
+            process_render(scene, frame)
+        except Exception as e:
+            print(f"Neural Render: auto processing failed: {str(e)}")
+
+    for entry in [entry for entry in _jobs if entry[2].done]:
+        _jobs.remove(entry)
+        scene_name, frame, job = entry
+        try:
+            job.result()
+            profiling.emit(job.id, job.timings)
+            # Still renders join the results; animation frames only refresh where they are already open
+            if frame is None:
+                gallery.add(job.output_path)
+            else:
+                gallery.refresh(job.output_path)
+            print(f"Neural Render: processed render saved: {job.output_path}")
+        except Exception as e:
+            # Forget the fingerprint so the same render is tried again next time
+            _last_fingerprints.pop((scene_name, frame), None)
+            print(f"Neural Render: auto processing failed: {str(e)}")
+    return TICK_INTERVAL
+
+def register():
+    bpy.app.handlers.render_complete.append(render_complete_handler)
+    bpy.app.handlers.render_write.append(render_write_handler)
+    bpy.app.timers.register(tick, first_interval=TICK_INTERVAL, persistent=True)
+
+def unregister():
+    if bpy.app.timers.is_registered(tick):
+        bpy.app.timers.unregister(tick)
+    bpy.app.handlers.render_write.remove(render_write_handler)
+    bpy.app.handlers.render_complete.remove(render_complete_handler)
@@ -0,0 +1,166 @@
+import base64
+import os
+import threading
+import time
+import uuid
+
+from .clients import get_client, get_session, get_uploader
+from .download import download_file, download_bytes
+from .models import REPLICATE, LOCAL
+from .predictions import JobCancelled, JobTimeout, poll
+from .scheduler import backoff
+
+# Where a model's predictions run, chosen by AIModel.provider. Every backend has the same lifecycle,
+# upload -> submit -> poll -> fetch, with cancel, so Job drives them all alike. Worker threads only; no bpy.
+
+CANCEL_GRACE = 30  # Seconds a self-hosted server gets to answer after its prediction was cancelled
+BUSY_RETRY_MAX = 1.0  # Longest wait before asking a busy server again; its GPU should not sit idle
+
+class Backend:
+    resumable = False  # Whether a prediction survives a Blender restart and can be picked up again
+
+    def upload(self, data):
+        """Return (reference for an image input, bytes actually sent)."""
+        raise NotImplementedError
+
+    def submit(self, model, input_params):
+        """Start a prediction; returns it as a Replicate-style dict with at least id and status."""
+        raise NotImplementedError
+
+    def poll(self, prediction, cancel_event=None, timeout=None):
+        """Wait for the prediction to reach a terminal state, cancelling it on cancel_event or timeout."""
+        raise NotImplementedError
+
+    def cancel(self, prediction_id):
+        raise NotImplementedError
+
+    def fetch(self, url, destination, progress=None):
+        # Outputs are either URLs or, from servers without file storage, inline data URIs
+        if url.startswith("data:"):
+            data = _decode_data_uri(url)
+            os.makedirs(os.path.dirname(destination) or ".", exist_ok=True)
+            with open(destination, "wb") as f:
+                f.write(data)
+            if progress is not None:
+                progress(len(data), len(data))
+        else:
+            download_file(url, destination, session=get_session(), progress=progress)
+
+    def fetch_bytes(self, url):
+        if url.startswith("data:"):
+            return _decode_data_uri(url)
+        return download_bytes(url, session=get_session())
+
+class ReplicateBackend(Backend):
+    resumable = True
+
+    def __init__(self, api_key, uploader=None):
+        self.client = get_client(api_key)
+        self.uploader = uploader or get_uploader(api_key)
+
+    def upload(self, data):
+        url = self.uploader.cached_url(data)
+        if url is not None:
+            return url, 0
+        return self.uploader.url_for(data), len(data)
+
+    def submit(self, model, input_params):
+        return self.client.create(model.model_id, input_params)
+
+    def poll(self, prediction, cancel_event=None, timeout=None):
+        return poll(self.client, prediction, cancel_event, timeout)
+
+    def get(self, prediction_id):
+        return self.client.get(prediction_id)
+
+    def cancel(self, prediction_id):
+        return self.client.cancel(prediction_id)
+
+class LocalBackend(Backend):
+    """A self-hosted server speaking Cog's HTTP prediction API, the format Replicate models are packaged in.
+
+    Cog answers a prediction request only once it has finished, so submit just assigns the id and poll makes
+    the request; a watcher thread cancels it through the server when cancel_event is set or timeout passes.
+    A server that is busy with another prediction (409) is retried until it is free.
+    """
+
+    def __init__(self, url):
+        if not url:
+            raise ValueError("No server URL set for the local inference backend")
+        self.url = url.rstrip("/")
+        self.session = get_session()
+
+    def upload(self, data):
+        # Inputs travel inline, so nothing is stored on the server
+        return _data_uri(data), len(data)
+
+    def submit(self, model, input_params):
+        return {"id": uuid.uuid4().hex, "status": "starting", "input": input_params}
+
+    def poll(self, prediction, cancel_event=None, timeout=None):
+        cancel_event = cancel_event or threading.Event()
+        deadline = time.monotonic() + timeout if timeout else None
+        done = threading.Event()
+        timed_out = threading.Event()
+
+        def watch():
+            while not done.is_set():
+                if cancel_event.wait(0.2) or (deadline is not None and time.monotonic() > deadline):
+                    if not cancel_event.is_set():
+                        timed_out.set()
+                    self.cancel(prediction["id"])
+                    return
+
+        watcher = threading.Thread(target=watch, name="neural_render_local_watch", daemon=True)
+        watcher.start()
+        # The read timeout only guards against a server that ignores the cancel request
+        read_timeout = timeout + CANCEL_GRACE if timeout else None
+        try:
+            attempt = 0
+            while True:
+                response = self.session.put(f"{self.url}/predictions/{prediction['id']}", json={"input": prediction["input"]},
+                                            timeout=(10, read_timeout))
+                if response.status_code != 409 or cancel_event.is_set() or timed_out.is_set():
+                    break
+                time.sleep(backoff(attempt, base=0.1, cap=BUSY_RETRY_MAX))
+                attempt += 1
+        except Exception:
+            if not (cancel_event.is_set() or timed_out.is_set()):
+                raise
+        finally:
+            done.set()
+        if cancel_event.is_set():
+            raise JobCancelled(f"Prediction {prediction['id']} was cancelled")
+        if timed_out.is_set():
+            raise JobTimeout(f"Prediction {prediction['id']} timed out after {timeout:.0f} s")
+        if response.status_code >= 400:
+            raise RuntimeError(f"Inference server error {response.status_code}: {response.text}")
+        return response.json()
+
+    def cancel(self, prediction_id):
+        try:
+            self.session.post(f"{self.url}/predictions/{prediction_id}/cancel", timeout=(10, 30))
+        except Exception:
+            pass  # Best effort, like cancelling on Replicate
+
+def _data_uri(data):
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        mime = "image/png"
+    elif data[:3] == b"\xff\xd8\xff":
+        mime = "image/jpeg"
+    elif data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        mime = "image/webp"
+    else:
+        mime = "application/octet-stream"
+    return f"data:{mime};base64,{base64.b64encode(data).decode('ascii')}"
+
+def _decode_data_uri(uri):
+    header, _, payload = uri.partition(",")
+    return base64.b64decode(payload) if header.endswith(";base64") else payload.encode()
+
+def get_backend(model, api_key=None, uploader=None):
+    if model.provider == LOCAL:
+        return LocalBackend(model.endpoint)
+    if model.provider == REPLICATE:
+        return ReplicateBackend(api_key, uploader)
+    raise ValueError(f"Unknown provider '{model.provider}' for {model.name}")
@@ -0,0 +1,138 @@
+import base64
+import http.server
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+
+from mock_replicate import PNG_SIGNATURE, MockConfig
+
+# Local stand-in for a self-hosted model container speaking Cog's HTTP API: synchronous
+# PUT /predictions/<id>, cancel and the health check. A container runs one prediction at a time and
+# answers 409 while busy; outputs come back inline as data URIs. Uses MockConfig's latency,
+# inference_time, output_size and outputs.
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    mock = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self):
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def do_PUT(self):
+        body = self._read_body()
+        time.sleep(self.mock.config.latency)
+        match = re.fullmatch(r"/predictions/(\w+)", self.path)
+        if match is None:
+            self._send_json(404, {"detail": "Not found"})
+            return
+        self.mock.count("PUT /predictions/{id}")
+        self.mock.add_bytes(len(body))
+        prediction = self.mock.run_prediction(match.group(1), json.loads(body).get("input", {}))
+        if prediction is None:
+            self.mock.count("busy 409")
+            self._send_json(409, {"detail": "Already running a prediction"})
+        else:
+            self._send_json(200, prediction)
+
+    def do_POST(self):
+        self._read_body()
+        match = re.fullmatch(r"/predictions/(\w+)/cancel", self.path)
+        if match is None:
+            self._send_json(404, {"detail": "Not found"})
+            return
+        self.mock.count("POST /predictions/{id}/cancel")
+        self._send_json(200 if self.mock.cancel_prediction(match.group(1)) else 404, {})
+
+    def do_GET(self):
+        if self.path == "/health-check":
+            self._send_json(200, {"status": "BUSY" if self.mock.running else "READY"})
+        else:
+            self._send_json(404, {"detail": "Not found"})
+
+class MockInferenceServer:
+    """Threaded HTTP server emulating a Cog model container; use as a context manager."""
+
+    def __init__(self, config=None, host="127.0.0.1", port=0):
+        self.config = config or MockConfig()
+        payload = PNG_SIGNATURE + os.urandom(max(0, self.config.output_size - len(PNG_SIGNATURE)))
+        self.output = f"data:image/png;base64,{base64.b64encode(payload).decode('ascii')}"
+        self.requests = Counter()
+        self.bytes_uploaded = 0
+        self.running = None  # Id of the prediction being run
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        handler = type("Handler", (_Handler,), {"mock": self})
+        self.httpd = http.server.ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, name):
+        with self._lock:
+            self.requests[name] += 1
+
+    def add_bytes(self, uploaded):
+        with self._lock:
+            self.bytes_uploaded += uploaded
+
+    def run_prediction(self, prediction_id, input_params):
+        # Returns the finished prediction, or None when another one is running
+        with self._lock:
+            if self.running is not None:
+                return None
+            self.running = prediction_id
+            self._cancelled.clear()
+        try:
+            canceled = self._cancelled.wait(self.config.inference_time)
+        finally:
+            with self._lock:
+                self.running = None
+        prediction = {"id": prediction_id, "input": input_params, "output": None, "error": None, "metrics": {}}
+        if canceled:
+            prediction["status"] = "canceled"
+        else:
+            prediction["status"] = "succeeded"
+            prediction["output"] = [self.output] * self.config.outputs
+            prediction["metrics"] = {"predict_time": self.config.inference_time}
+        return prediction
+
+    def cancel_prediction(self, prediction_id):
+        with self._lock:
+            if self.running != prediction_id:
+                return False
+            self._cancelled.set()
+            return True
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="mock_inference_server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
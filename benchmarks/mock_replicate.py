@@ -0,0 +1,220 @@
+import http.server
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+# Local stand-in for the parts of Replicate the add-on talks to: the Files API, prediction
+# create/poll/cancel and the output CDN. Latency, bandwidth, failures and output sizes are configurable.
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+CHUNK_SIZE = 64 * 1024
+
+@dataclass
+class MockConfig:
+    latency: float = 0.05  # Seconds added to every request
+    queue_time: float = 0.0  # Seconds a prediction stays "starting"
+    inference_time: float = 1.0  # Seconds a prediction stays "processing", reported as predict_time
+    bandwidth: float = 50.0  # CDN download speed in MB/s, 0 for unlimited
+    failure_rate: float = 0.0  # Chance a create is throttled (429), a poll returns 503 or a CDN download drops halfway; all are retried
+    output_size: int = 4 * 1024 * 1024  # Bytes per output image
+    outputs: int = 2  # Images per prediction; Control Net reads the second one
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, so the add-on's connection pool is exercised
+    mock = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self):
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def _should_fail(self):
+        return random.random() < self.mock.config.failure_rate
+
+    def do_POST(self):
+        body = self._read_body()
+        time.sleep(self.mock.config.latency)
+        self.mock.count("POST " + re.sub(r"/[0-9a-f]{32}", "/{id}", self.path))
+
+        if self.path == "/v1/files":
+            self.mock.add_bytes(uploaded=len(body))
+            expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+            self._send_json(201, {"urls": {"get": f"{self.mock.url}/uploads/{uuid.uuid4().hex}"},
+                                  "expires_at": expires_at.isoformat()})
+        elif self.path == "/v1/predictions":
+            if self._should_fail():
+                self.mock.count("injected 429")
+                self._send_json(429, {"detail": "Request was throttled"}, {"Retry-After": "0.2"})
+                return
+            self._send_json(201, self.mock.create_prediction(json.loads(body)))
+        elif match := re.fullmatch(r"/v1/predictions/(\w+)/cancel", self.path):
+            prediction = self.mock.cancel_prediction(match.group(1))
+            if prediction is None:
+                self._send_json(404, {"detail": "Not found"})
+            else:
+                self._send_json(200, prediction)
+        else:
+            self._send_json(404, {"detail": "Not found"})
+
+    def do_GET(self):
+        time.sleep(self.mock.config.latency)
+        self.mock.count("GET " + re.sub(r"/[0-9a-f]{32}(?:/\d+\.png)?", "/{id}", self.path))
+
+        if match := re.fullmatch(r"/v1/predictions/(\w+)", self.path):
+            if self._should_fail():
+                self.mock.count("injected 503")
+                self._send_json(503, {"detail": "Injected failure"}, {"Retry-After": "0.2"})
+                return
+            prediction = self.mock.get_prediction(match.group(1))
+            if prediction is None:
+                self._send_json(404, {"detail": "Not found"})
+            else:
+                self._send_json(200, prediction)
+        elif self.path.startswith("/cdn/"):
+            self._send_output()
+        else:
+            self._send_json(404, {"detail": "Not found"})
+
+    def _send_output(self):
+        data = self.mock.payload
+        start = 0
+        match = re.fullmatch(r"bytes=(\d+)-", self.headers.get("Range", ""))
+        if match:
+            start = int(match.group(1))
+            if start >= len(data):
+                self.send_response(416)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(data) - 1}/{len(data)}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(data) - start))
+        self.end_headers()
+
+        # A dropped connection sends the full length header but only part of the body
+        end = len(data)
+        if self._should_fail():
+            self.mock.count("injected drop")
+            end = start + (len(data) - start) // 2
+            self.close_connection = True
+
+        bandwidth = self.mock.config.bandwidth * 1024 * 1024
+        for offset in range(start, end, CHUNK_SIZE):
+            chunk = data[offset:min(offset + CHUNK_SIZE, end)]
+            self.wfile.write(chunk)
+            self.mock.add_bytes(downloaded=len(chunk))
+            if bandwidth:
+                time.sleep(len(chunk) / bandwidth)
+
+class MockReplicateServer:
+    """Threaded HTTP server emulating Replicate; use as a context manager."""
+
+    def __init__(self, config=None, host="127.0.0.1", port=0):
+        self.config = config or MockConfig()
+        self.payload = PNG_SIGNATURE + os.urandom(max(0, self.config.output_size - len(PNG_SIGNATURE)))
+        self.predictions = {}
+        self.requests = Counter()
+        self.bytes_uploaded = 0
+        self.bytes_downloaded = 0
+        self._lock = threading.Lock()
+        handler = type("Handler", (_Handler,), {"mock": self})
+        self.httpd = http.server.ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def api_url(self):
+        return f"{self.url}/v1"
+
+    def count(self, name):
+        with self._lock:
+            self.requests[name] += 1
+
+    def add_bytes(self, uploaded=0, downloaded=0):
+        with self._lock:
+            self.bytes_uploaded += uploaded
+            self.bytes_downloaded += downloaded
+
+    def create_prediction(self, payload):
+        prediction_id = uuid.uuid4().hex
+        with self._lock:
+            self.predictions[prediction_id] = {
+                "id": prediction_id,
+                "version": payload.get("version"),
+                "input": payload.get("input", {}),
+                "created": time.monotonic(),
+                "canceled": False,
+            }
+        return self.get_prediction(prediction_id)
+
+    def cancel_prediction(self, prediction_id):
+        with self._lock:
+            record = self.predictions.get(prediction_id)
+            if record is None:
+                return None
+            record["canceled"] = True
+        return self.get_prediction(prediction_id)
+
+    def get_prediction(self, prediction_id):
+        with self._lock:
+            record = self.predictions.get(prediction_id)
+        if record is None:
+            return None
+
+        elapsed = time.monotonic() - record["created"]
+        prediction = {"id": prediction_id, "version": record["version"], "input": record["input"],
+                      "output": None, "error": None, "metrics": {}}
+        if record["canceled"]:
+            prediction["status"] = "canceled"
+        elif elapsed < self.config.queue_time:
+            prediction["status"] = "starting"
+        elif elapsed < self.config.queue_time + self.config.inference_time:
+            prediction["status"] = "processing"
+        else:
+            prediction["status"] = "succeeded"
+            prediction["output"] = [f"{self.url}/cdn/{prediction_id}/{index}.png" for index in range(self.config.outputs)]
+            prediction["metrics"] = {"predict_time": self.config.inference_time}
+        return prediction
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="mock_replicate", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
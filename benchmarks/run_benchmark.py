@@ -0,0 +1,246 @@
+"""Offline benchmark of the add-on's job pipeline against a local Replicate stand-in.
+
+Drives the real Job/TiledJob code (upload, create, poll, download) with synthetic inputs, so the
+add-on's own overhead and regressions can be measured without paying for predictions:
+
+    python benchmarks/run_benchmark.py --scenario all --latency 0.05 --bandwidth 20 --failure-rate 0.02
+
+--backend local runs the same scenarios against a stand-in for a self-hosted Cog model server instead.
+
+The stand-in server runs in its own process and every scenario in a fresh one, so peak RSS is the
+add-on's alone and is not carried over from earlier scenarios.
+"""
+
+import argparse
+import importlib
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+import types
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+
+from mock_inference_server import MockInferenceServer
+from mock_replicate import PNG_SIGNATURE, MockConfig, MockReplicateServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = "neural_render"
+
+SCENARIOS = ["single", "batch", "tiled"]
+
+def load_core():
+    # Import the bpy-free modules without running the add-on's __init__, which needs Blender
+    package = types.ModuleType(PACKAGE)
+    package.__path__ = [ROOT]
+    sys.modules[PACKAGE] = package
+    return types.SimpleNamespace(**{
+        name: importlib.import_module(f"{PACKAGE}.{name}")
+        for name in ("clients", "jobs", "models", "profiling", "tiling")
+    })
+
+def synthetic_input(size):
+    # Unique bytes per job, so the uploader's URL cache never short-circuits an upload
+    return PNG_SIGNATURE + os.urandom(max(0, size - len(PNG_SIGNATURE)))
+
+def default_params(model):
+    return {parameter.name: parameter.default for parameter in model.parameters}
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024  # Bytes on macOS, KiB elsewhere
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+class Run:
+    """Latency of every unit of work (a job, or a whole tiled image) in one scenario."""
+
+    def __init__(self, profiling):
+        self.latencies = []
+        self.failures = 0
+        self.profiling = profiling
+        self._lock = threading.Lock()
+
+    def track(self, jobs, started):
+        # Called once per unit with all of its jobs; the unit finishes with its last job
+        profiling = self.profiling
+        remaining = [len(jobs)]
+
+        def finished(job, future):
+            failed = future.cancelled() or future.exception() is not None
+            if not failed:
+                # Stage timings go through the same profiling module the operators use
+                profiling.emit(job.id, job.timings)
+            with self._lock:
+                self.failures += failed
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    self.latencies.append(time.perf_counter() - started)
+
+        for job in jobs:
+            job.future.add_done_callback(lambda future, job=job: finished(job, future))
+
+def make_job(core, model, args, output_dir, index, size=None, in_memory=False):
+    output_path = None if in_memory else os.path.join(output_dir, f"{model.key}_{index:04d}.png")
+    return core.jobs.Job("benchmark", model, default_params(model), synthetic_input(size or args.input_size), output_path)
+
+def run_single(core, model, args, output_dir, run):
+    for index in range(args.repeat):
+        job = make_job(core, model, args, output_dir, index).submit()
+        run.track([job], time.perf_counter())
+        wait([job])
+
+def run_batch(core, model, args, output_dir, run):
+    # Same bounded in-flight window as the frame range operator
+    pending = list(range(args.frames))
+    in_flight = []
+    while pending or in_flight:
+        while pending and len(in_flight) < args.concurrency:
+            job = make_job(core, model, args, output_dir, pending.pop(0)).submit()
+            run.track([job], time.perf_counter())
+            in_flight.append(job)
+        time.sleep(0.01)
+        in_flight = [job for job in in_flight if not job.done]
+
+def run_tiled(core, model, args, output_dir, run):
+    boxes = core.tiling.tile_boxes(args.width, args.height, args.tile_size, args.tile_overlap)
+    full_area = args.width * args.height
+    for index in range(args.repeat):
+        started = time.perf_counter()
+        jobs = [
+            make_job(core, model, args, output_dir, index, size=args.input_size * w * h // full_area, in_memory=True)
+            for x, y, w, h in boxes
+        ]
+        tiled = core.jobs.TiledJob(jobs, boxes, args.width, args.height, args.tile_overlap, None).submit()
+        run.track(jobs, started)
+        wait(tiled.jobs)
+
+def wait(jobs):
+    for job in jobs:
+        try:
+            job.result()
+        except Exception:
+            pass  # Counted by Run.track
+
+def run_scenario(core, scenario, model, args, output_dir):
+    baseline_rss = peak_rss_mb()
+    core.profiling.reset()
+    run = Run(core.profiling)
+    started = time.perf_counter()
+    {"single": run_single, "batch": run_batch, "tiled": run_tiled}[scenario](core, model, args, output_dir, run)
+    wall = time.perf_counter() - started
+    # Done callbacks may still be running for the last jobs
+    while len(run.latencies) < {"single": args.repeat, "batch": args.frames, "tiled": args.repeat}[scenario]:
+        time.sleep(0.01)
+
+    return {
+        "scenario": scenario,
+        "model": model.name,
+        "units": len(run.latencies),
+        "failures": run.failures,
+        "wall_s": round(wall, 3),
+        "throughput_per_s": round(len(run.latencies) / wall, 3) if wall else None,
+        "latency_p50_s": round(percentile(run.latencies, 0.5), 3),
+        "latency_p95_s": round(percentile(run.latencies, 0.95), 3),
+        "latency_p99_s": round(percentile(run.latencies, 0.99), 3),
+        "baseline_rss_mb": round(baseline_rss, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "stages_p50_ms": {stage: round(p50, 1) for stage, count, p50, p95 in core.profiling.summary()},
+    }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=SCENARIOS + ["all"], default="all")
+    parser.add_argument("--backend", choices=["replicate", "local"], default="replicate",
+                        help="Run predictions on the Replicate stand-in or on a self-hosted server stand-in")
+    parser.add_argument("--model", action="append", help="Model name; repeat for several. Defaults to every model")
+    parser.add_argument("--repeat", type=int, default=5, help="Images per single and tiled scenario")
+    parser.add_argument("--frames", type=int, default=24, help="Frames in the batch scenario")
+    parser.add_argument("--concurrency", type=int, default=4, help="Jobs in flight in the batch scenario")
+    parser.add_argument("--input-size", type=int, default=1536 * 1024, help="Upload size in bytes per image")
+    parser.add_argument("--width", type=int, default=4096, help="Image width in the tiled scenario")
+    parser.add_argument("--height", type=int, default=4096, help="Image height in the tiled scenario")
+    parser.add_argument("--tile-size", type=int, default=1024)
+    parser.add_argument("--tile-overlap", type=int, default=64)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds added to every request")
+    parser.add_argument("--queue-time", type=float, default=0.0, help="Seconds a prediction is queued")
+    parser.add_argument("--inference-time", type=float, default=1.0, help="Seconds a prediction runs")
+    parser.add_argument("--bandwidth", type=float, default=50.0, help="CDN bandwidth in MB/s, 0 for unlimited")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Chance of a 503 poll or dropped download")
+    parser.add_argument("--output-size", type=int, default=4 * 1024 * 1024, help="Output image size in bytes")
+    parser.add_argument("--json", help="Also write the results to this file")
+    return parser.parse_args(argv)
+
+def serve(backend, config, connection):
+    # Runs in its own process, so the server's buffers and threads never count towards the add-on's
+    server = MockInferenceServer(config) if backend == "local" else MockReplicateServer(config)
+    with server:
+        connection.send(server.url if backend == "local" else server.api_url)
+        connection.recv()  # Stop request
+        connection.send(dict(server.requests))
+
+def scenario_process(scenario, model_name, args, backend, url, output_dir):
+    # A fresh process per scenario: ru_maxrss is a lifetime peak, so a shared one would only ever grow
+    core = load_core()
+    model = core.models.get_model(model_name)
+    if backend == "local":
+        model = replace(model, provider=core.models.LOCAL, endpoint=url)
+    else:
+        core.clients.set_api_url(url)
+    try:
+        return run_scenario(core, scenario, model, args, output_dir)
+    finally:
+        core.clients.close()
+        core.jobs.shutdown_executor()
+
+def main(argv=None):
+    args = parse_args(argv)
+    core = load_core()
+
+    models = core.models.available_models
+    if args.model:
+        models = [core.models.get_model(name) for name in args.model]
+        if None in models:
+            sys.exit(f"Unknown model; choose from: {', '.join(model.name for model in core.models.available_models)}")
+    scenarios = SCENARIOS if args.scenario == "all" else [args.scenario]
+
+    config = MockConfig(latency=args.latency, queue_time=args.queue_time, inference_time=args.inference_time,
+                        bandwidth=args.bandwidth, failure_rate=args.failure_rate, output_size=args.output_size)
+    context = multiprocessing.get_context("spawn")
+    connection, server_connection = context.Pipe()
+    server = context.Process(target=serve, args=(args.backend, config, server_connection), daemon=True)
+    server.start()
+    results = []
+    try:
+        url = connection.recv()
+        with tempfile.TemporaryDirectory() as output_dir:
+            for scenario in scenarios:
+                for model in models:
+                    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                        result = pool.submit(scenario_process, scenario, model.name, args, args.backend, url, output_dir).result()
+                    results.append(result)
+                    print(f"{scenario:<7} {model.name:<18} {result['units']:>4} done {result['failures']:>3} failed  "
+                          f"{result['throughput_per_s']:>7.2f}/s  p50 {result['latency_p50_s']:>6.2f}s  "
+                          f"p95 {result['latency_p95_s']:>6.2f}s  p99 {result['latency_p99_s']:>6.2f}s  "
+                          f"rss {result['baseline_rss_mb']:>6.1f} -> {result['peak_rss_mb']:>6.1f} MB")
+        connection.send("stop")
+        server_requests = connection.recv()
+    finally:
+        server.join(timeout=5)
+        if server.is_alive():
+            server.terminate()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"config": vars(args), "results": results, "server_requests": server_requests}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+
+# On-disk, content-addressed cache of prediction outputs. Used from worker threads, so no bpy here.
+
+CACHE_FOLDER = "neural_render_cache"  # Created inside the chosen directory, which may hold the user's own files
+KEY_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+_lock = threading.Lock()
+
+def hash_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+def make_key(input_hash, model_id, input_params):
+    # Parameters are serialized with sorted keys so dict ordering never changes the key
+    params = json.dumps(input_params, sort_keys=True, default=str)
+    return hash_bytes(f"{input_hash}\n{model_id}\n{params}".encode("utf-8"))
+
+def is_deterministic(input_params):
+    # A seed of 0 means random, so only fixed seeds give reproducible (cacheable) results
+    return input_params.get("seed", 0) != 0
+
+class ResultCache:
+    def __init__(self, directory, max_size_bytes):
+        self.directory = os.path.join(directory, CACHE_FOLDER)
+        self.max_size_bytes = max_size_bytes
+
+    def _path(self, key):
+        return os.path.join(self.directory, key)
+
+    def get(self, key):
+        path = self._path(key)
+        with _lock:
+            if not os.path.exists(path):
+                return None
+            # Touch on hit so eviction is least-recently-used rather than oldest-written
+            os.utime(path, None)
+        return path
+
+    def fetch(self, key, destination):
+        path = self.get(key)
+        if path is None:
+            return False
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        shutil.copyfile(path, destination)
+        return True
+
+    def read(self, key):
+        path = self.get(key)
+        if path is None:
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+
+    def put(self, key, source_path):
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = f"{self._path(key)}.{threading.get_ident()}.tmp"
+        shutil.copyfile(source_path, temp_path)
+        self._commit(key, temp_path)
+
+    def put_bytes(self, key, data):
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = f"{self._path(key)}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        self._commit(key, temp_path)
+
+    def _commit(self, key, temp_path):
+        with _lock:
+            os.replace(temp_path, self._path(key))
+            self._evict()
+
+    def _evict(self):
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                # Only entries this cache wrote are counted or deleted
+                if entry.is_file() and KEY_PATTERN.fullmatch(entry.name):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_size_bytes:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+            except OSError:
+                pass
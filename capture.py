@@ -0,0 +1,174 @@
+import os
+import struct
+import tempfile
+import zlib
+from contextlib import nullcontext
+
+import bpy
+import numpy as np
+
+from .pixels import FILE_FORMATS, image_to_array, array_to_image, decode_image_array
+
+_capturing = False
+
+def encode_png(pixels, width, height):
+    # pixels: flat float RGBA in Blender's bottom-up row order
+    rgba = np.asarray(pixels, dtype=np.float32).reshape(height, width, 4)[::-1]
+    data = (np.clip(rgba, 0.0, 1.0) * 255.0 + 0.5).astype(np.uint8)
+
+    # Each scanline is prefixed with filter type 0 (none)
+    raw = np.zeros((height, width * 4 + 1), dtype=np.uint8)
+    raw[:, 1:] = data.reshape(height, width * 4)
+
+    def chunk(tag, payload):
+        return struct.pack(">I", len(payload)) + tag + payload + struct.pack(">I", zlib.crc32(tag + payload) & 0xffffffff)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    return b"".join([
+        b"\x89PNG\r\n\x1a\n",
+        chunk(b"IHDR", header),
+        chunk(b"IDAT", zlib.compress(raw.tobytes(), 6)),
+        chunk(b"IEND", b""),
+    ])
+
+def png_size(data):
+    """(width, height) read from a PNG's header, or None for any other format."""
+    if data[:8] != b"\x89PNG\r\n\x1a\n" or data[12:16] != b"IHDR":
+        return None
+    return struct.unpack(">II", data[16:24])
+
+def encode_image(image, file_format, quality):
+    """Encode an image datablock as JPEG/WebP/PNG bytes. Blender only encodes these to files, so use a temp one."""
+    with tempfile.NamedTemporaryFile(suffix=f".{file_format}", delete=False) as temp_file:
+        temp_path = temp_file.name
+    try:
+        image.filepath_raw = temp_path
+        image.file_format = FILE_FORMATS[file_format]
+        image.save(filepath=temp_path, quality=quality)
+        with open(temp_path, "rb") as f:
+            return f.read()
+    finally:
+        os.unlink(temp_path)
+
+def preprocess_input(data, encoding, input_params):
+    """Resize captured PNG bytes to the model's effective input size and re-encode them for upload.
+
+    Returns the bytes to upload and a dict describing the encoding actually used.
+    """
+    pixels = decode_image_array(data)
+    height, width = pixels.shape[:2]
+    max_size = encoding.resolve_max_size(input_params)
+    scale = min(1.0, max_size / min(width, height)) if max_size else 1.0
+
+    if scale == 1.0 and encoding.format == "png":
+        encoded = data  # Already a PNG at the right size
+        new_width, new_height = width, height
+    else:
+        image = array_to_image(pixels, name="Neural Render Preprocess")
+        try:
+            if scale < 1.0:
+                image.scale(max(1, round(width * scale)), max(1, round(height * scale)))
+            new_width, new_height = image.size
+            encoded = encode_image(image, encoding.format, encoding.quality)
+        finally:
+            bpy.data.images.remove(image)
+
+    return encoded, {
+        "source_width": width,
+        "source_height": height,
+        "source_bytes": len(data),
+        "width": new_width,
+        "height": new_height,
+        "format": encoding.format,
+        "quality": encoding.quality,
+        "bytes": len(encoded),
+    }
+
+def capture_image(image):
+    """Return the image encoded as PNG bytes, without a disk round-trip when Blender allows it."""
+    width, height = image.size
+    # Render Result has no pixel buffer exposed to Python, and float buffers are scene-linear and
+    # need the view transform that save_render applies, so both go through one temporary write.
+    if image.type == 'IMAGE' and not image.is_float and width and height:
+        return encode_png(image_to_array(image), width, height)
+
+    with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp_file:
+        temp_path = temp_file.name
+    try:
+        image.save_render(temp_path)
+        with open(temp_path, "rb") as f:
+            return f.read()
+    finally:
+        os.unlink(temp_path)
+
+def capturing():
+    # True while capture_render's own render runs, so render handlers can tell it from a user render
+    return _capturing
+
+def capture_render(scene, timings=None):
+    """Render the current frame and return it as PNG bytes, leaving scene.render.filepath untouched."""
+    global _capturing
+    with timings.stage("render") if timings else nullcontext():
+        _capturing = True
+        try:
+            bpy.ops.render.render()
+        finally:
+            _capturing = False
+    render_result = bpy.data.images.get('Render Result')
+    if render_result is None:
+        raise RuntimeError("Render produced no result")
+    with timings.stage("encode") if timings else nullcontext():
+        return capture_image(render_result)
+
+# Render passes a control source reads: (view layer flag, Render Layers output)
+CONTROL_PASSES = {"DEPTH": ("use_pass_z", "Depth"), "MIST": ("use_pass_mist", "Mist")}
+
+def capture_render_with_control(scene, source, timings=None):
+    """Render the current frame and return (render PNG bytes, control map PNG bytes) for a control source.
+
+    Passes are read from a temporary compositor Viewer node; the view layer and node tree are restored after.
+    """
+    from . import controlmaps
+
+    view_layer = bpy.context.view_layer
+    flag, socket = CONTROL_PASSES.get(source, (None, None))
+    if flag is None:
+        input_data = capture_render(scene, timings)
+        with timings.stage("encode") if timings else nullcontext():
+            control = controlmaps.edge_map(decode_image_array(input_data))
+            return input_data, encode_png(control, control.shape[1], control.shape[0])
+
+    use_pass, use_nodes = getattr(view_layer, flag), scene.use_nodes
+    # A tree the user has switched off must not change the render: its nodes are muted for the capture and
+    # a temporary Composite node passes the render through as it is
+    bypass = not use_nodes and scene.node_tree is not None
+    setattr(view_layer, flag, True)
+    scene.use_nodes = True  # Creates the default Render Layers -> Composite tree if there is none
+    tree = scene.node_tree
+    muted = [node for node in tree.nodes if not node.mute] if bypass else []
+    for node in muted:
+        node.mute = True
+    layers = tree.nodes.new("CompositorNodeRLayers")
+    viewer = tree.nodes.new("CompositorNodeViewer")
+    added = [layers, viewer]
+    try:
+        layers.scene = scene
+        layers.layer = view_layer.name
+        if bypass:
+            composite = tree.nodes.new("CompositorNodeComposite")
+            added.append(composite)
+            tree.links.new(layers.outputs["Image"], composite.inputs["Image"])
+        tree.links.new(layers.outputs[socket], viewer.inputs["Image"])
+        tree.nodes.active = viewer
+        input_data = capture_render(scene, timings)
+        with timings.stage("encode") if timings else nullcontext():
+            values = image_to_array(bpy.data.images["Viewer Node"])
+            control = controlmaps.depth_map(values) if source == "DEPTH" else controlmaps.mist_map(values)
+            return input_data, encode_png(control, control.shape[1], control.shape[0])
+    finally:
+        for node in added:
+            tree.nodes.remove(node)
+        for node in muted:
+            node.mute = False
+        scene.use_nodes = use_nodes
+        setattr(view_layer, flag, use_pass)
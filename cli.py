@@ -0,0 +1,164 @@
+"""Headless entry point for processing a frame range, or one shard of it, on a render farm node.
+
+    blender -b scene.blend --python-exit-code 1 --python-expr \
+        "import sys, bl_ext.user_default.neural_render.cli as cli; sys.exit(cli.main())" \
+        -- --model "Control Net" --set prompt="oil painting" --shard 3/16
+
+Every node gets the same command with its own --shard; frames are dealt out round-robin, so each node
+processes every n-th frame. Outputs go next to the render output (or --output) together with a JSON
+manifest per shard. Nothing here touches the UI.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import zlib
+from dataclasses import replace
+
+import bpy
+
+from .models import available_models, get_model, LOCAL
+from .properties import build_input_params, apply_provider
+from .operator import FrameBatch, needs_api_key, request_outputs, apply_control_source, resolve_output_dir, output_name
+from .utils import get_result_cache, get_job_timeout
+from .dependencies import dependencies_available, MISSING_DEPENDENCIES_MESSAGE
+from . import clients
+
+API_KEY_VARIABLE = "REPLICATE_API_TOKEN"
+
+_CONVERTERS = {
+    "int": int,
+    "float": float,
+    "bool": lambda value: value.lower() in ("1", "true", "yes", "on"),
+}
+
+def parse_shard(value):
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Shard must look like 3/16, got '{value}'")
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"Shard index must be between 1 and {count}, got {index}")
+    return index, count
+
+def parse_frames(value):
+    start, _, end = value.partition("-")
+    try:
+        return int(start), int(end or start)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Frames must look like 1-250 or 42, got '{value}'")
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="neural_render.cli", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", help="Model name; defaults to the model selected in the scene")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                        help="Override a model parameter; repeat for several")
+    parser.add_argument("--frames", type=parse_frames, help="Frame range, e.g. 1-250; defaults to the scene range")
+    parser.add_argument("--shard", type=parse_shard, default=(1, 1), help="Process slice i of n, e.g. 3/16")
+    parser.add_argument("--output", help="Output directory; defaults to the scene's render output directory")
+    parser.add_argument("--use-existing-frames", action="store_true",
+                        help="Read already rendered frames from the render output path instead of rendering them")
+    parser.add_argument("--skip-duplicates", action=argparse.BooleanOptionalAction,
+                        help="Reuse one prediction for near-identical frames; defaults to the scene setting")
+    parser.add_argument("--concurrency", type=int, help="Predictions in flight; defaults to the add-on preference")
+    parser.add_argument("--server", metavar="URL",
+                        help="Run predictions on this self-hosted inference server instead of the model's configured backend")
+    parser.add_argument("--api-key", help=f"Replicate API key; defaults to ${API_KEY_VARIABLE}, then the add-on preference")
+    return parser.parse_args(argv)
+
+def script_args():
+    # Blender passes everything after "--" through to the script
+    return sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+
+def apply_overrides(model, input_params, overrides):
+    parameters = {parameter.name: parameter for parameter in model.parameters}
+    for override in overrides:
+        name, separator, value = override.partition("=")
+        if not separator or name not in parameters:
+            raise ValueError(f"Unknown parameter '{name}' for {model.name}; choose from: {', '.join(parameters)}")
+        parameter = parameters[name]
+        convert = _CONVERTERS.get(parameter.type)
+        value = convert(value) if convert else value
+        if parameter.type == "enum" and parameter.options and value not in parameter.options:
+            raise ValueError(f"{name} must be one of: {', '.join(parameter.options)}")
+        input_params[name] = value
+    return input_params
+
+def shard_frames(frames, index, count):
+    return frames[index - 1::count]
+
+def process(scene, preferences, args):
+    """Run this node's shard to completion and return the manifest."""
+    if not dependencies_available():
+        raise RuntimeError(MISSING_DEPENDENCIES_MESSAGE)
+
+    model = get_model(args.model) if args.model else get_model(scene.replicate_model)
+    if model is None:
+        raise ValueError(f"Model '{args.model}' not found; choose from: {', '.join(m.name for m in available_models)}")
+    model = replace(model, provider=LOCAL, endpoint=args.server) if args.server else apply_provider(scene, model)
+    api_key = args.api_key or os.environ.get(API_KEY_VARIABLE) or preferences.api_key
+    if needs_api_key(model, api_key):
+        raise RuntimeError(f"No Replicate API key: pass --api-key, set ${API_KEY_VARIABLE} or set it in the add-on preferences")
+    input_params, outputs = request_outputs(scene, model, apply_overrides(model, build_input_params(scene, model), args.set))
+    if not args.use_existing_frames:
+        input_params = apply_control_source(scene, model, input_params)
+
+    start, end = args.frames or (scene.frame_start, scene.frame_end)
+    index, count = args.shard
+    frames = shard_frames(list(range(start, end + 1, scene.frame_step)), index, count)
+
+    output_dir = bpy.path.abspath(args.output) if args.output else resolve_output_dir(scene.render.filepath)
+    os.makedirs(output_dir, exist_ok=True)
+
+    groups = None
+    skip_duplicates = scene.replicate_skip_duplicate_frames if args.skip_duplicates is None else args.skip_duplicates
+    if skip_duplicates:
+        from .perceptual import FrameGroups
+
+        groups = FrameGroups(scene.replicate_duplicate_threshold)
+        if input_params.get("seed") == 0:
+            # Like fix_seed, but every shard must pick the same seed, so it comes from the file name
+            input_params = dict(input_params, seed=zlib.crc32(os.path.basename(bpy.data.filepath).encode()) & 0x7FFFFFFF or 1)
+
+    batch = FrameBatch(
+        scene, model, api_key, input_params, outputs, frames, output_dir, output_name(scene.render.filepath),
+        cache=get_result_cache(preferences), timeout=get_job_timeout(preferences), preprocess=preferences.preprocess_inputs,
+        max_jobs=args.concurrency or preferences.max_concurrent_jobs, groups=groups, use_existing_frames=args.use_existing_frames,
+    )
+    print(f"Neural Render: shard {index}/{count}, {len(frames)} frames with {model.name} into {output_dir}")
+    while not batch.done:
+        # Rendering happens here on the main thread; predictions and downloads overlap with it
+        if not batch.step():
+            time.sleep(0.2)
+
+    return {
+        "blend_file": bpy.data.filepath,
+        "output_dir": output_dir,
+        "scene": scene.name,
+        "model": model.name,
+        "model_id": model.model_id,
+        "input_params": input_params,
+        "shard": {"index": index, "count": count},
+        "frames": [batch.entries[frame] for frame in frames],
+    }
+
+def main(argv=None):
+    args = parse_args(script_args() if argv is None else argv)
+    scene = bpy.context.scene
+    preferences = bpy.context.preferences.addons[__package__].preferences
+    try:
+        manifest = process(scene, preferences, args)
+    finally:
+        clients.close()
+
+    index, count = args.shard
+    manifest_path = os.path.join(manifest["output_dir"], f"neural_render_manifest_{index:03d}_of_{count:03d}.json")
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2, default=str)
+
+    failed = sum(entry["status"] != "succeeded" for entry in manifest["frames"])
+    print(f"Neural Render: {len(manifest['frames']) - failed}/{len(manifest['frames'])} frames processed, manifest: {manifest_path}")
+    return 1 if failed else 0
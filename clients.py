@@ -0,0 +1,76 @@
+import threading
+
+from .uploads import ReplicateFileUploader
+from .predictions import API_URL, ReplicateAPI
+
+# Add-on wide network clients, shared by every job so one keep-alive pool serves prediction
+# calls, polling, uploads and downloads. Created lazily on first use and dropped when the API key changes.
+
+# Enough for every worker thread (jobs.MAX_WORKERS) to hold a connection to both the API and the CDN
+POOL_MAXSIZE = 32
+
+_lock = threading.Lock()
+_api_key = None
+_client = None
+_uploader = None
+_session = None
+_api_url = API_URL
+
+def get_session():
+    global _session
+    with _lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=POOL_MAXSIZE)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+def set_api_url(url):
+    """Point every client at another Replicate-compatible server, e.g. the benchmark stand-in."""
+    global _api_url, _client, _uploader
+    with _lock:
+        _api_url = url.rstrip("/")
+        _client = None
+        _uploader = None
+
+def _check_api_key(api_key):
+    global _api_key, _client, _uploader
+    if api_key != _api_key:
+        _api_key = api_key
+        _client = None
+        _uploader = None
+
+def get_client(api_key):
+    global _client
+    session = get_session()
+    with _lock:
+        _check_api_key(api_key)
+        if _client is None:
+            _client = ReplicateAPI(api_key, session, _api_url)
+        return _client
+
+def get_uploader(api_key):
+    global _uploader
+    session = get_session()
+    with _lock:
+        _check_api_key(api_key)
+        if _uploader is None:
+            # Remembers uploaded URLs, so it lives as long as the API key does
+            _uploader = ReplicateFileUploader(api_key, session=session, endpoint=f"{_api_url}/files")
+        return _uploader
+
+def reset():
+    with _lock:
+        _check_api_key(None)
+
+def close():
+    global _session
+    reset()
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
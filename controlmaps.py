@@ -0,0 +1,46 @@
+import numpy as np
+
+from .perceptual import luminance
+
+# Control images built from exact render data instead of estimated remotely. Input and output arrays are
+# (height, width, 4) float32 RGBA as in pixels.py; outputs are grey maps in 0..1. Nothing here touches bpy.
+
+# Depth beyond this counts as background (Blender writes 1e10 where no surface was hit)
+BACKGROUND_DEPTH = 1e9
+
+def _grey(values):
+    grey = np.empty(values.shape + (4,), dtype=np.float32)
+    grey[..., :3] = values[..., None]
+    grey[..., 3] = 1.0
+    return grey
+
+def _stretch(values, mask, low=1.0, high=99.0):
+    # Percentiles rather than min/max, so a few stray samples do not flatten the whole map
+    if not mask.any():
+        return np.zeros_like(values)
+    lo, hi = np.percentile(values[mask], [low, high])
+    return np.clip((values - lo) / max(hi - lo, 1e-6), 0.0, 1.0)
+
+def depth_map(depth):
+    """Z pass to a depth control map: near is white, far and background are black.
+
+    Uses inverse depth, like the monocular estimators depth control nets were trained with.
+    """
+    depth = depth[..., 0]
+    valid = (depth > 0) & (depth < BACKGROUND_DEPTH)
+    disparity = np.where(valid, 1.0 / np.maximum(depth, 1e-6), 0.0)
+    return _grey(np.where(valid, _stretch(disparity, valid), 0.0))
+
+def mist_map(mist):
+    """Mist pass (0 at the camera, 1 at the mist end) to a depth control map."""
+    return _grey(1.0 - np.clip(mist[..., 0], 0.0, 1.0))
+
+def edge_map(pixels):
+    """Soft edges: Sobel gradient magnitude of the render's luminance, stretched to 0..1."""
+    padded = np.pad(luminance(pixels), 1, mode="edge")
+    gx = (padded[:-2, 2:] + 2 * padded[1:-1, 2:] + padded[2:, 2:]) - (padded[:-2, :-2] + 2 * padded[1:-1, :-2] + padded[2:, :-2])
+    gy = (padded[2:, :-2] + 2 * padded[2:, 1:-1] + padded[2:, 2:]) - (padded[:-2, :-2] + 2 * padded[:-2, 1:-1] + padded[:-2, 2:])
+    magnitude = np.hypot(gx, gy)
+    edges = magnitude > 0
+    scale = np.percentile(magnitude[edges], 99.0) if edges.any() else 1.0
+    return _grey(np.clip(magnitude / max(scale, 1e-6), 0.0, 1.0))
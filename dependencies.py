@@ -0,0 +1,44 @@
+import importlib.util
+import os
+import subprocess
+import sys
+
+import bpy
+
+from .paths import user_directory
+
+REQUIRED_PACKAGES = ['requests']
+
+MISSING_DEPENDENCIES_MESSAGE = "Required Python packages are missing. Install them from the Neural Render add-on preferences."
+
+_available = None
+
+def _marker_path():
+    # Keyed on Blender and Python version: a Blender upgrade ships a new Python and needs its own check
+    python_version = f"{sys.version_info.major}.{sys.version_info.minor}"
+    blender_version = ".".join(str(v) for v in bpy.app.version[:2])
+    return os.path.join(user_directory(), f"dependencies_blender{blender_version}_python{python_version}.ok")
+
+def missing_packages():
+    # find_spec locates packages without importing them
+    return [package for package in REQUIRED_PACKAGES if importlib.util.find_spec(package) is None]
+
+def dependencies_available():
+    global _available
+    if _available is None:
+        marker = _marker_path()
+        if os.path.exists(marker):
+            _available = True
+        else:
+            _available = not missing_packages()
+            if _available:
+                open(marker, "w").close()
+    return _available
+
+def install_dependencies():
+    global _available
+    for package in missing_packages():
+        subprocess.check_call([sys.executable, "-m", "pip", "install", package])
+    importlib.invalidate_caches()
+    _available = None
+    return dependencies_available()
@@ -0,0 +1,86 @@
+import os
+import random
+import time
+
+CHUNK_SIZE = 1024 * 1024
+TIMEOUT = (10, 60)  # (connect, read) seconds
+
+def _backoff(attempt):
+    return min(0.5 * 2 ** attempt, 30.0) * (0.5 + random.random() / 2)
+
+def _total_size(response, offset):
+    # "Content-Range: bytes 100-199/200" on resumed requests, Content-Length otherwise
+    content_range = response.headers.get("Content-Range", "")
+    if "/" in content_range and not content_range.endswith("/*"):
+        return int(content_range.rsplit("/", 1)[1])
+    length = response.headers.get("Content-Length")
+    return int(length) + offset if length is not None else None
+
+def download_file(url, destination, session=None, progress=None, retries=5, chunk_size=CHUNK_SIZE):
+    """Stream url to destination through a .part file, resuming with HTTP Range after dropped connections.
+
+    progress, if given, is called as progress(bytes_done, bytes_total_or_None) from the calling thread.
+    The destination only appears once the download is complete.
+    """
+    import requests
+
+    http = session or requests
+    os.makedirs(os.path.dirname(destination) or ".", exist_ok=True)
+    part_path = destination + ".part"
+    if os.path.exists(part_path):
+        os.unlink(part_path)  # Leftover from another job; we cannot tell if it is the same content
+
+    attempt = 0
+    while True:
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        try:
+            with http.get(url, headers=headers, stream=True, timeout=TIMEOUT) as response:
+                if offset and response.status_code == 416:
+                    break  # Nothing left to fetch
+                if response.status_code >= 500 or response.status_code == 429:
+                    raise requests.ConnectionError(f"Server returned {response.status_code}")
+                if response.status_code not in (200, 206):
+                    raise RuntimeError(f"Failed to download the processed image. Status code: {response.status_code}")
+                if response.status_code == 200:
+                    offset = 0  # Server ignored the Range header, start over
+
+                total = _total_size(response, offset)
+                with open(part_path, "ab" if offset else "wb") as f:
+                    for chunk in response.iter_content(chunk_size):
+                        f.write(chunk)
+                        offset += len(chunk)
+                        if progress is not None:
+                            progress(offset, total)
+
+            if total is not None and offset < total:
+                raise requests.ConnectionError(f"Connection dropped after {offset} of {total} bytes")
+            break
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+            attempt += 1
+            if attempt > retries:
+                raise RuntimeError(f"Download failed after {retries} retries: {str(e)}") from e
+            time.sleep(_backoff(attempt))
+
+    os.replace(part_path, destination)
+    return destination
+
+def download_bytes(url, session=None, retries=5):
+    """Fetch a small output straight into memory, with the same retry policy as download_file."""
+    import requests
+
+    http = session or requests
+    attempt = 0
+    while True:
+        try:
+            response = http.get(url, timeout=TIMEOUT)
+            if response.status_code >= 500 or response.status_code == 429:
+                raise requests.ConnectionError(f"Server returned {response.status_code}")
+            if response.status_code != 200:
+                raise RuntimeError(f"Failed to download the processed image. Status code: {response.status_code}")
+            return response.content
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+            attempt += 1
+            if attempt > retries:
+                raise RuntimeError(f"Download failed after {retries} retries: {str(e)}") from e
+            time.sleep(_backoff(attempt))
@@ -0,0 +1,169 @@
+import os
+import time
+
+import bpy
+import bpy.utils.previews
+
+# Session gallery of processed results. Each result keeps only a small preview; its full-resolution image
+# datablock is loaded when the result is shown, and datablocks not on screen are evicted, least recently
+# shown first, once they add up to more than the memory budget. Results are shown in one reusable
+# Image Editor window. Main thread only.
+
+MAX_RESULTS = 32
+
+_previews = None
+_results = []  # (output path, label, time added), newest first
+_shown = []  # Output paths whose image was shown, least recently first
+
+def results():
+    return _results
+
+def preview_icon(path):
+    if _previews is None:
+        return 0
+    preview = _previews.get(path)
+    if preview is None:
+        # Blender generates the thumbnail in the background and caches it for the session
+        preview = _previews.load(path, path, 'IMAGE')
+    return preview.icon_id
+
+def find_image(path):
+    for image in bpy.data.images:
+        if image.filepath and bpy.path.abspath(image.filepath) == path:
+            return image
+    return None
+
+def add(path, label=None, image=None):
+    """Add a result, or move it to the front if its path is already listed, refreshing a stale preview or image.
+
+    image adopts a datablock already holding the result, such as an assembled tiled image.
+    """
+    global _results
+    replaced = any(entry[0] == path for entry in _results)
+    _results = [entry for entry in _results if entry[0] != path]
+    _results.insert(0, (path, label or os.path.basename(path), time.time()))
+    for entry in _results[MAX_RESULTS:]:
+        forget(entry[0])
+    del _results[MAX_RESULTS:]
+
+    if replaced and _previews is not None and path in _previews:
+        _previews[path].reload()
+    loaded = find_image(path)
+    if image is None and loaded is not None and loaded.source == 'FILE':
+        loaded.reload()  # The file was overwritten by a newer result
+    if image is not None:
+        _touch(path)
+
+def refresh(path):
+    # Reload the result wherever it is already open, without loading it otherwise
+    image = find_image(path)
+    if image is not None and image.source == 'FILE':
+        image.reload()
+
+def forget(path):
+    if path in _shown:
+        _shown.remove(path)
+    image = find_image(path)
+    if image is not None and image.users <= 1 and not _in_use(image):
+        bpy.data.images.remove(image)
+
+def clear():
+    for path, _, _ in list(_results):
+        forget(path)
+    _results.clear()
+    if _previews is not None:
+        _previews.clear()
+
+def show(path, budget):
+    """Load the result at full resolution into the viewer and evict other results down to budget bytes."""
+    image = find_image(path) or bpy.data.images.load(path, check_existing=True)
+    _touch(path)
+    show_in_viewer(image)
+    evict(budget)
+    return image
+
+def _touch(path):
+    if path in _shown:
+        _shown.remove(path)
+    _shown.append(path)
+
+def image_bytes(image):
+    if not image.has_data:
+        return 0
+    width, height = image.size
+    return width * height * image.channels * (4 if image.is_float else 1)
+
+def _displayed():
+    displayed = set()
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'IMAGE_EDITOR' and area.spaces.active.image is not None:
+                displayed.add(area.spaces.active.image.name)
+    return displayed
+
+def _in_use(image, displayed=None):
+    displayed = _displayed() if displayed is None else displayed
+    return image.use_fake_user or image.name in displayed
+
+def evict(budget):
+    """Free full-resolution results that are not on screen, oldest first, until the rest fit in budget bytes."""
+    displayed = _displayed()
+    images = [(path, find_image(path)) for path in _shown]
+    total = sum(image_bytes(image) for _, image in images if image is not None)
+    for path, image in images:
+        if total <= budget:
+            break
+        if image is None:
+            _shown.remove(path)
+            continue
+        if _in_use(image, displayed):
+            continue
+        size = image_bytes(image)
+        if image.users <= 1:
+            bpy.data.images.remove(image)
+        elif image.source == 'FILE':
+            image.buffers_free()  # Still used by a material or node; it reloads from disk on demand
+        else:
+            continue  # Generated and used elsewhere, its pixels exist nowhere else
+        total -= size
+        _shown.remove(path)
+
+def _viewer_area(temporary=True):
+    # The viewer is a temporary window holding a single Image Editor
+    for window in bpy.context.window_manager.windows:
+        if window.screen.is_temporary or not temporary:
+            for area in window.screen.areas:
+                if area.type == 'IMAGE_EDITOR':
+                    return area
+    return None
+
+def show_in_viewer(image):
+    """Show image in the viewer window, opening it only if it is not open yet."""
+    if bpy.app.background:
+        return
+    area = _viewer_area()
+    if area is None:
+        # The render view opens where Preferences > Interface > Temporary Editors puts renders,
+        # a new Image Editor window by default, or an Image Editor in the main window
+        bpy.ops.render.view_show('INVOKE_DEFAULT')
+        area = _viewer_area() or _viewer_area(temporary=False)
+        if area is None:
+            return  # Renders are set to keep the user interface as it is
+    area.spaces.active.image = image
+    area.tag_redraw()
+
+def reset_images():
+    # Datablocks of the previous file are gone; the previews and result list stay valid
+    _shown.clear()
+
+def register():
+    global _previews
+    _previews = bpy.utils.previews.new()
+
+def unregister():
+    global _previews
+    _results.clear()
+    _shown.clear()
+    if _previews is not None:
+        bpy.utils.previews.remove(_previews)
+        _previews = None
@@ -0,0 +1,348 @@
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from .cache import hash_bytes, make_key, is_deterministic
+from .backends import get_backend
+from .models import models_by_id
+from .predictions import get_output, is_transport_error, JobCancelled
+from .profiling import JobTimings
+from .scheduler import Scheduler, INTERACTIVE, BACKGROUND, DEFAULT_MODEL_LIMIT
+from . import jobstore
+
+# Worker-side code must not touch bpy: everything here runs off Blender's main thread.
+
+# Upper bound on jobs running at once; callers bound their own share of it (see max_concurrent_jobs)
+MAX_WORKERS = 16
+
+_executor = None
+_executor_lock = threading.Lock()
+_scheduler = None
+_model_limit = DEFAULT_MODEL_LIMIT
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="neural_render")
+        return _executor
+
+def get_scheduler():
+    global _scheduler
+    executor = get_executor()
+    with _executor_lock:
+        if _scheduler is None or _scheduler.executor is not executor:
+            _scheduler = Scheduler(executor, MAX_WORKERS, _model_limit)
+        return _scheduler
+
+def set_model_limit(model_limit):
+    # Predictions of one model allowed to run at once, across every job in the session
+    global _model_limit
+    _model_limit = model_limit
+    if _scheduler is not None:
+        _scheduler.set_model_limit(model_limit)
+
+def shutdown_executor():
+    global _executor, _scheduler
+    with _executor_lock:
+        if _scheduler is not None:
+            _scheduler.shutdown()
+            _scheduler = None
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+def output_urls(model, output, names=("result",)):
+    """Map the requested output names to their URLs in the prediction output; missing outputs are left out."""
+    if not isinstance(output, list):
+        output = [output]
+    urls = {}
+    for model_output in model.outputs:
+        if model_output.name in names and model_output.index < len(output) and output[model_output.index]:
+            urls[model_output.name] = output[model_output.index]
+    if "result" not in urls:
+        raise RuntimeError("The model did not return an image")
+    return urls
+
+def output_file_paths(output_path, names):
+    # Extra outputs sit next to the result: render_ai.png, render_ai_control_map.png
+    root, ext = os.path.splitext(output_path)
+    return {name: output_path if name == "result" else f"{root}_{name}{ext}" for name in names}
+
+# Jobs submitted in this session and not finished yet, for the cancel button
+_live_jobs = set()
+_live_jobs_lock = threading.Lock()
+
+def live_jobs():
+    with _live_jobs_lock:
+        return list(_live_jobs)
+
+def cancel_all_jobs():
+    jobs = live_jobs()
+    for job in jobs:
+        job.cancel()
+    return len(jobs)
+
+# Ids of stored jobs being worked on in this session, so a file load never resumes them a second time
+_active = set()
+_active_lock = threading.Lock()
+
+class Job:
+    """A single prediction: upload, run and download on a worker thread."""
+
+    def __init__(self, api_key, model, input_params, input_data, output_path, cache=None, uploader=None, meta=None, store=None, timeout=None,
+                 timings=None, outputs=("result",), control_data=None, priority=INTERACTIVE):
+        self.id = uuid.uuid4().hex
+        self.api_key = api_key
+        self.model = model
+        self.input_params = input_params
+        self.input_data = input_data  # Encoded image bytes, shared by every image input of the model
+        self.control_data = control_data  # Encoded control map for the model's control_input, None reuses input_data
+        self.output_path = output_path  # None keeps the output in memory and returns its bytes
+        self.outputs = outputs  # Names of the model outputs to fetch; extra outputs need an output_path
+        self.output_paths = {}  # Output name -> file written, filled in as the job finishes
+        self.cache = cache
+        self.uploader = uploader  # Replicate file uploader, None uses the shared one
+        self.store = store  # JobStore recording the job for crash recovery; only used for file outputs
+        self.prediction_id = None
+        self.timeout = timeout  # Seconds before the remote prediction is cancelled, None waits forever
+        self.priority = priority  # Scheduler class: interactive jobs start ahead of batches
+        self.cancel_event = threading.Event()
+        self.timings = timings or JobTimings(model.name)
+        self.cache_hit = False
+        self.progress = None  # (bytes downloaded, total bytes or None), written by the worker
+        self.meta = meta or {}  # Descriptive job metadata, e.g. the input encoding used
+        self.timings.meta = self.meta
+        self.future = None
+        self._backend = None  # Resolved from the model's provider when the job runs
+
+    def submit(self):
+        with _live_jobs_lock:
+            _live_jobs.add(self)
+        self.future = get_scheduler().submit(self.run, self.priority, self.model.model_id)
+        self.future.add_done_callback(self._finished)
+        return self
+
+    def _finished(self, future):
+        with _live_jobs_lock:
+            _live_jobs.discard(self)
+
+    def cancel(self):
+        # Stops the job at its next checkpoint and cancels the remote prediction if one is running
+        self.cancel_event.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    @property
+    def done(self):
+        return self.future is not None and self.future.done()
+
+    def result(self):
+        # Re-raises any exception from the worker thread
+        if self.future.cancelled():
+            raise JobCancelled("Job was cancelled before it started")
+        return self.future.result()
+
+    def _set_progress(self, done, total):
+        if self.cancel_event.is_set():
+            raise JobCancelled("Download was cancelled")
+        self.progress = (done, total)
+
+    def _record(self, **fields):
+        if self.store is not None:
+            self.store.update(self.id, **fields)
+
+    def run(self):
+        input_hash = hash_bytes(self.input_data + (self.control_data or b""))
+        cache_key = None
+        # The cache holds one file per key, so jobs fetching extra outputs always run
+        if self.cache is not None and is_deterministic(self.input_params) and tuple(self.outputs) == ("result",):
+            cache_key = make_key(input_hash, self.model.model_id, self.input_params)
+            if self.output_path is None:
+                data = self.cache.read(cache_key)
+                if data is not None:
+                    self.cache_hit = True
+                    return data
+            elif self.cache.fetch(cache_key, self.output_path):
+                self.cache_hit = True
+                self.output_paths = {"result": self.output_path}
+                return self.output_path
+
+        self._backend = get_backend(self.model, self.api_key, self.uploader)
+        if self.output_path is None or not self._backend.resumable:
+            self.store = None  # In-memory outputs and self-hosted predictions cannot be recovered after a restart
+        if self.store is not None:
+            self.store.add(self.id, self.model.model_id, input_hash, self.input_params, output_file_paths(self.output_path, self.outputs),
+                           self.meta)
+            with _active_lock:
+                _active.add(self.id)
+
+        try:
+            urls = output_urls(self.model, self._predict(), self.outputs)
+
+            if self.output_path is None:
+                with self.timings.stage("download"):
+                    data = self._backend.fetch_bytes(urls["result"])
+                self.timings.bytes_down = len(data)
+                if cache_key is not None:
+                    self.cache.put_bytes(cache_key, data)
+                return data
+
+            self._record(state=jobstore.DOWNLOADING)
+            with self.timings.stage("download"):
+                self._download(urls)
+            self.timings.bytes_down = sum(os.path.getsize(path) for path in self.output_paths.values())
+            self._record(state=jobstore.SUCCEEDED)
+        except JobCancelled:
+            self._record(state=jobstore.CANCELED)
+            raise
+        except Exception as e:
+            # A paid prediction cut off by the network may still finish, so its row stays resumable
+            if self.prediction_id is None or not is_transport_error(e):
+                self._record(state=jobstore.FAILED, error=str(e))
+            raise
+        finally:
+            with _active_lock:
+                _active.discard(self.id)
+
+        if cache_key is not None:
+            self.cache.put(cache_key, self.output_path)
+        return self.output_path
+
+    def _download(self, urls):
+        paths = output_file_paths(self.output_path, urls)
+        extras = [name for name in urls if name != "result"]
+        if not extras:
+            self._backend.fetch(urls["result"], paths["result"], progress=self._set_progress)
+        else:
+            # Extra outputs come down alongside the result over the shared session; progress follows the result
+            with ThreadPoolExecutor(max_workers=len(extras), thread_name_prefix="neural_render_output") as pool:
+                futures = [pool.submit(self._backend.fetch, urls[name], paths[name]) for name in extras]
+                self._backend.fetch(urls["result"], paths["result"], progress=self._set_progress)
+                for future in futures:
+                    future.result()
+        self.output_paths = paths
+
+    def _upload(self, data):
+        url, sent = self._backend.upload(data)
+        self.timings.bytes_up += sent
+        return url
+
+    def _predict(self):
+        # The image is uploaded once and the same URL feeds every image input of the model
+        with self.timings.stage("upload"):
+            image_url = self._upload(self.input_data)
+            control_url = self._upload(self.control_data) if self.control_data is not None else None
+        input_params = dict(self.input_params)
+        for key in self.model.image_inputs:
+            input_params[key] = image_url
+        if control_url is not None:
+            input_params[self.model.control_input] = control_url
+
+        if self.cancel_event.is_set():
+            raise JobCancelled("Job was cancelled before the prediction was created")
+
+        start = time.perf_counter()
+        prediction = self._backend.submit(self.model, input_params)
+        self.prediction_id = prediction["id"]
+        self._record(prediction_id=prediction["id"], state=jobstore.RUNNING)
+        prediction = self._backend.poll(prediction, self.cancel_event, self.timeout)
+
+        # The server reports the model's own run time; the rest of the wall time is queueing and polling
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        inference_ms = min(elapsed_ms, ((prediction.get("metrics") or {}).get("predict_time") or 0.0) * 1000.0)
+        self.timings.add("inference", inference_ms)
+        self.timings.add("queue", elapsed_ms - inference_ms)
+        return get_output(prediction)
+
+class TiledJob:
+    """One Job per tile of a large image; done once every tile is done."""
+
+    def __init__(self, jobs, boxes, width, height, overlap, output_path, timings=None):
+        self.id = uuid.uuid4().hex
+        self.jobs = jobs
+        self.boxes = boxes
+        self.width = width
+        self.height = height
+        self.overlap = overlap
+        self.output_path = output_path
+        self.timings = timings or JobTimings(jobs[0].model.name)  # Main-thread stages; tiles keep their own
+
+    @property
+    def model(self):
+        return self.jobs[0].model
+
+    @property
+    def cache_hit(self):
+        return all(job.cache_hit for job in self.jobs)
+
+    @property
+    def progress(self):
+        return (sum(job.done for job in self.jobs), len(self.jobs))
+
+    def submit(self):
+        for job in self.jobs:
+            job.submit()
+        return self
+
+    def cancel(self):
+        for job in self.jobs:
+            job.cancel()
+
+    @property
+    def done(self):
+        return all(job.done for job in self.jobs)
+
+    def result(self):
+        # Encoded tile outputs, in the same order as boxes
+        return [job.result() for job in self.jobs]
+
+def resume_job(record, api_key, store, timeout=None):
+    """Finish a prediction recorded before a restart: wait for it remotely and download its output.
+
+    timeout (seconds from now) cancels the remote prediction, like a job's own timeout.
+    """
+    try:
+        model = models_by_id.get(record["model_id"])
+        if model is None:
+            raise RuntimeError(f"Unknown model {record['model_id']}")
+        backend = get_backend(model, api_key)
+        prediction = backend.poll(backend.get(record["prediction_id"]), timeout=timeout)
+        paths = record["output_paths"]
+        if isinstance(paths, list):
+            paths = {"result": paths[0]}  # Recorded before jobs had several outputs
+        urls = output_urls(model, get_output(prediction), paths)
+        store.update(record["id"], state=jobstore.DOWNLOADING)
+        for name, url in urls.items():
+            backend.fetch(url, paths[name])
+        store.update(record["id"], state=jobstore.SUCCEEDED)
+        return [paths[name] for name in urls]
+    except Exception as e:
+        if not is_transport_error(e):
+            store.update(record["id"], state=jobstore.FAILED, error=str(e))
+        raise
+    finally:
+        with _active_lock:
+            _active.discard(record["id"])
+
+def resume_unfinished_jobs(api_key, store, timeout=None):
+    futures = []
+    for record in store.unfinished():
+        with _active_lock:
+            if record["id"] in _active:
+                continue  # Still running in this session, or already being resumed
+            _active.add(record["id"])
+        if not store.claim(record["id"], record["owner"]):
+            with _active_lock:
+                _active.discard(record["id"])
+            continue  # Another Blender sharing the store took it first
+        # Recovered work queues behind everything the user starts and counts towards its model's cap
+        futures.append(get_scheduler().submit(lambda record=record: resume_job(record, api_key, store, timeout),
+                                              BACKGROUND, record["model_id"]))
+    return futures
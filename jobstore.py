@@ -0,0 +1,179 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+# Durable record of every paid prediction, so work in flight survives a crash or a closed Blender.
+# Written from worker threads; no bpy here.
+
+SUBMITTED = "submitted"  # Recorded locally, prediction not created yet
+RUNNING = "running"  # Prediction created remotely, prediction_id is known
+DOWNLOADING = "downloading"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELED = "canceled"
+
+RESUMABLE_STATES = (RUNNING, DOWNLOADING)
+
+# Several Blenders can share one store (a second instance, farm nodes with a shared home), so every row
+# names the process working on it, which refreshes a heartbeat while it has unfinished rows
+OWNER = f"{socket.gethostname()}:{os.getpid()}"
+HEARTBEAT_INTERVAL = 30.0  # Seconds
+STALE_AFTER = 120.0  # Seconds without a heartbeat before a row's owner counts as gone; allows for clock skew
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    model_id TEXT NOT NULL,
+    input_hash TEXT,
+    params TEXT,
+    prediction_id TEXT,
+    state TEXT NOT NULL,
+    output_paths TEXT,
+    error TEXT,
+    owner TEXT,
+    heartbeat REAL,
+    meta TEXT
+)
+"""
+
+# Columns added after the first release, created on stores written by older versions
+ADDED_COLUMNS = {"owner": "TEXT", "heartbeat": "REAL", "meta": "TEXT"}
+
+def _pid_alive(pid):
+    if os.name == "nt":
+        return True  # os.kill would terminate the process there; the heartbeat decides instead
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def owned_elsewhere(owner, heartbeat):
+    """Whether another live process is working on a row, so it must not be resumed here."""
+    if owner is None or owner == OWNER:
+        return False
+    if heartbeat is None or time.time() - heartbeat > STALE_AFTER:
+        return False  # Crashed, closed, or cut off from the store
+    host, _, pid = owner.rpartition(":")
+    if host == socket.gethostname() and pid.isdigit():
+        return _pid_alive(int(pid))
+    return True
+
+class JobStore:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._heartbeat_lock = threading.Lock()
+        self._heartbeat_thread = None
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute(SCHEMA)
+                existing = {row["name"] for row in connection.execute("PRAGMA table_info(jobs)")}
+                for name, kind in ADDED_COLUMNS.items():
+                    if name not in existing:
+                        connection.execute(f"ALTER TABLE jobs ADD COLUMN {name} {kind}")
+        finally:
+            connection.close()
+
+    def _connect(self):
+        # A short-lived connection per call keeps the store safe to use from any thread
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def _execute(self, sql, args=()):
+        with self._lock:
+            connection = self._connect()
+            try:
+                with connection:
+                    return connection.execute(sql, args).fetchall()
+            finally:
+                connection.close()
+
+    def _execute_count(self, sql, args=()):
+        # Number of rows changed, for statements whose effect must be checked
+        with self._lock:
+            connection = self._connect()
+            try:
+                with connection:
+                    return connection.execute(sql, args).rowcount
+            finally:
+                connection.close()
+
+    def add(self, job_id, model_id, input_hash, params, output_paths, meta=None):
+        now = time.time()
+        self._execute(
+            "INSERT INTO jobs (id, created_at, updated_at, model_id, input_hash, params, state, output_paths, owner, heartbeat, meta) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (job_id, now, now, model_id, input_hash, json.dumps(params, default=str), SUBMITTED, json.dumps(output_paths),
+             OWNER, now, json.dumps(meta or {}, default=str)),
+        )
+        self._start_heartbeat()
+
+    def claim(self, job_id, owner):
+        """Take a row over from owner; False when another process claimed it first."""
+        claimed = self._execute_count(
+            "UPDATE jobs SET owner = ?, heartbeat = ? WHERE id = ? AND owner IS ?", (OWNER, time.time(), job_id, owner)
+        ) == 1
+        if claimed:
+            self._start_heartbeat()
+        return claimed
+
+    def _start_heartbeat(self):
+        with self._heartbeat_lock:
+            if self._heartbeat_thread is None:
+                self._heartbeat_thread = threading.Thread(target=self._beat, name="neural_render_heartbeat", daemon=True)
+                self._heartbeat_thread.start()
+
+    def _beat(self):
+        # Runs while this process owns unfinished rows; a later add or claim starts it again
+        states = (SUBMITTED, *RESUMABLE_STATES)
+        placeholders = ", ".join("?" for _ in states)
+        while True:
+            time.sleep(HEARTBEAT_INTERVAL)
+            with self._heartbeat_lock:
+                try:
+                    owned = self._execute_count(
+                        f"UPDATE jobs SET heartbeat = ? WHERE owner = ? AND state IN ({placeholders})", (time.time(), OWNER, *states)
+                    )
+                except sqlite3.Error:
+                    continue  # Store briefly locked or unreachable; the next beat tries again
+                if not owned:
+                    self._heartbeat_thread = None
+                    return
+
+    def update(self, job_id, **fields):
+        if "output_paths" in fields:
+            fields["output_paths"] = json.dumps(fields["output_paths"])
+        fields["updated_at"] = time.time()
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        self._execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+
+    def get(self, job_id):
+        rows = self._execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        return self._decode(rows[0]) if rows else None
+
+    def unfinished(self):
+        # Rows another live process is still working on are left to it
+        placeholders = ", ".join("?" for _ in RESUMABLE_STATES)
+        rows = self._execute(
+            f"SELECT * FROM jobs WHERE state IN ({placeholders}) AND prediction_id IS NOT NULL ORDER BY created_at",
+            RESUMABLE_STATES,
+        )
+        return [self._decode(row) for row in rows if not owned_elsewhere(row["owner"], row["heartbeat"])]
+
+    @staticmethod
+    def _decode(row):
+        job = dict(row)
+        job["params"] = json.loads(job["params"]) if job["params"] else {}
+        job["output_paths"] = json.loads(job["output_paths"]) if job["output_paths"] else []
+        job["meta"] = json.loads(job["meta"]) if job["meta"] else {}
+        return job
@@ -1,6 +1,10 @@
 from dataclasses import dataclass, field
 from typing import List, Dict, Any
 
+# Where a model's predictions run; see backends.py
+REPLICATE = "Replicate"
+LOCAL = "Local"  # A self-hosted server speaking Cog's HTTP API, at the model's endpoint
+
 @dataclass
 class ModelParameter:
     name: str
@@ -11,6 +15,32 @@ class ModelParameter:
     max: float = None
     options: List[str] = None
 
+@dataclass
+class InputEncoding:
+    format: str = "webp"  # png, jpg or webp
+    quality: int = 90
+    max_size: int = None  # Shorter side in pixels the model effectively works at, None keeps the resolution
+    max_size_param: str = None  # Parameter that sets the effective size instead, when its enable_param is on
+    enable_param: str = None
+
+    def resolve_max_size(self, input_params):
+        if self.max_size_param and input_params.get(self.enable_param, True):
+            return input_params.get(self.max_size_param, self.max_size)
+        return self.max_size
+
+@dataclass
+class ModelOutput:
+    name: str  # "result" is the generated image; others are saved next to it with the name as suffix
+    index: int  # Position in the prediction's output list
+    optional: bool = False  # Only fetched when extra outputs are requested
+
+@dataclass
+class PreviewSettings:
+    steps_param: str  # Parameter holding the number of denoising steps
+    steps: int = 8  # Steps for the preview, or the full run's own if it uses fewer
+    max_size: int = 512  # Shorter side of the preview input in pixels
+    params: Dict[str, Any] = None  # Other parameters overridden for the preview
+
 @dataclass
 class AIModel:
     name: str
@@ -18,11 +48,24 @@ class AIModel:
     model_id: str
     description: str
     parameters: List[ModelParameter]
+    image_inputs: List[str] = field(default_factory=lambda: ["image"])
+    input_encoding: InputEncoding = None  # None uploads the captured PNG as is
+    outputs: List[ModelOutput] = field(default_factory=lambda: [ModelOutput("result", 0)])
+    extra_outputs_param: str = None  # Input that asks the model for its optional outputs
+    control_input: str = None  # Image input that can take a control map made from render passes instead
+    control_maps: Dict[str, Dict[str, Any]] = None  # Control source -> parameters telling the model what it gets
+    endpoint: str = None  # Server URL for self-hosted providers
+    preview: PreviewSettings = None  # Fast low-resolution pass shown before the full result, None if unsupported
+
+    @property
+    def key(self):
+        # Identifier used for the model's settings PropertyGroup, e.g. "flux_control_net"
+        return self.name.lower().replace(" ", "_")
 
 # Existing Clarity Upscaler model definition
 clarity_upscaler = AIModel(
     name="Clarity Upscaler",
-    provider="Replicate",
+    provider=REPLICATE,
     model_id="philz1337x/clarity-upscaler:dfad41707589d68ecdccd1dfa600d55a208f9310748e44bfe35b4a6291453d5e",
     description="Upscale and enhance images using AI",
     parameters=[
@@ -56,13 +99,24 @@ clarity_upscaler = AIModel(
         ModelParameter("handfix", "enum", "disabled", "Use clarity to fix hands in the image", options=["disabled", "hands_only", "image_and_hands"]),
         ModelParameter("pattern", "bool", False, "Upscale a pattern with seamless tiling"),
         ModelParameter("output_format", "enum", "png", "Format of the output images", options=["webp", "jpg", "png"])
-    ]
+    ],
+    # The upscaler works from fine detail, so keep quality high and only resize when it would downscale anyway
+    input_encoding=InputEncoding("webp", 95, max_size_param="downscaling_resolution", enable_param="downscaling"),
+    # The preview input is already small, so the model must not resize it again
+    preview=PreviewSettings("num_inference_steps", params={"downscaling": False})
 )
 
+# Control maps computed locally from the render, and the control type each one drives
+CONTROL_MAPS = {
+    "DEPTH": {"control_type": "depth"},
+    "MIST": {"control_type": "depth"},
+    "EDGES": {"control_type": "soft_edge"},
+}
+
 # New Control Net model
 control_net = AIModel(
     name="Control Net",
-    provider="Replicate",
+    provider=REPLICATE,
     model_id="jagilley/controlnet-canny:aff48af9c68d162388d230a2ab003f68d2638d88307bdaf1c2f1ac95079c9613",
     description="Generate images using Control Net with various control types",
     parameters=[
@@ -78,12 +132,19 @@ control_net = AIModel(
         ModelParameter("depth_preprocessor", "enum", "DepthAnything", "Preprocessor to use with depth control net", options=["Midas", "Zoe", "DepthAnything", "Zoe-DepthAnything"]),
         ModelParameter("soft_edge_preprocessor", "enum", "HED", "Preprocessor to use with soft edge control net", options=["HED", "TEED", "PiDiNet"]),
         ModelParameter("image_to_image_strength", "float", 0, "Strength of image to image control", 0, 1)
-    ]
+    ],
+    image_inputs=["image", "control_image"],  # The rendered image is also used as control image
+    input_encoding=InputEncoding("webp", 90, max_size=1024),  # Preprocessors and generation run at ~1 MP
+    # The control map always comes first, followed by the generated image
+    outputs=[ModelOutput("control_map", 0, optional=True), ModelOutput("result", 1)],
+    control_input="control_image",
+    control_maps=CONTROL_MAPS,
+    preview=PreviewSettings("steps")
 )
 
 flux_control_net = AIModel(
     name="Flux Control Net",
-    provider="Replicate",
+    provider=REPLICATE,
     model_id="xlabs-ai/flux-dev-controlnet:f2c31c31d81278a91b2447a304dae654c64a5d5a70340fba811bb1cbd41019a2",
     description="Generate images using Flux Control Net with various control types",
     parameters=[
@@ -99,8 +160,22 @@ flux_control_net = AIModel(
         ModelParameter("depth_preprocessor", "enum", "DepthAnything", "Preprocessor to use with depth control net", options=["Midas", "Zoe", "DepthAnything", "Zoe-DepthAnything"]),
         ModelParameter("soft_edge_preprocessor", "enum", "HED", "Preprocessor to use with soft edge control net", options=["HED", "TEED", "PiDiNet"]),
         ModelParameter("image_to_image_strength", "float", 0, "Strength of image to image control", 0, 1)
-    ]
+    ],
+    image_inputs=["image", "control_image"],  # The rendered image is also used as control image
+    input_encoding=InputEncoding("webp", 90, max_size=1024),  # Preprocessors and generation run at ~1 MP
+    outputs=[ModelOutput("result", 0), ModelOutput("control_map", 1, optional=True)],
+    extra_outputs_param="return_preprocessed_image",
+    control_input="control_image",
+    control_maps=CONTROL_MAPS,
+    preview=PreviewSettings("steps")
 )
 
 # Update the available_models list
-available_models = [clarity_upscaler, control_net, flux_control_net]
\ No newline at end of file
+available_models = [clarity_upscaler, control_net, flux_control_net]
+
+# Indexes so lookups during UI redraws and job setup do not scan the list
+models_by_name = {model.name: model for model in available_models}
+models_by_id = {model.model_id: model for model in available_models}
+
+def get_model(name):
+    return models_by_name.get(name)
\ No newline at end of file
@@ -1,12 +1,139 @@
 import bpy
 import os
-import replicate
+import random
+import shutil
 import tempfile
-import requests
+from contextlib import nullcontext
 
 #type:ignore
 
-from .models import available_models, clarity_upscaler
+from .models import clarity_upscaler, get_model, InputEncoding, REPLICATE
+from .properties import build_input_params, apply_provider
+from .jobs import Job, TiledJob, cancel_all_jobs, live_jobs
+from .predictions import JobCancelled
+from .scheduler import INTERACTIVE, BATCH
+from .profiling import JobTimings
+from . import profiling
+from .utils import get_result_cache, get_job_store, get_gallery_budget, get_job_timeout
+from . import gallery
+from .dependencies import dependencies_available, MISSING_DEPENDENCIES_MESSAGE
+
+# capture, pixels and tiling pull in NumPy, so they are imported on first use to keep registration light
+
+def get_selected_model(scene):
+    selected_model = get_model(scene.replicate_model)
+    if not selected_model:
+        raise ValueError(f"Selected model '{scene.replicate_model}' not found")
+    return apply_provider(scene, selected_model)
+
+def needs_api_key(model, api_key):
+    # Only Replicate takes the API key; self-hosted servers are reached directly
+    return model.provider == REPLICATE and not api_key
+
+def prepare_input(model, input_params, input_data, preprocess=True, timings=None):
+    # Returns the bytes to upload and the job metadata describing how they were encoded
+    from .capture import png_size, preprocess_input
+
+    if not preprocess or model.input_encoding is None:
+        if timings:
+            timings.width, timings.height = png_size(input_data) or (None, None)
+        return input_data, {"input": {"format": "png", "bytes": len(input_data)}}
+
+    with timings.stage("preprocess") if timings else nullcontext():
+        input_data, encoding = preprocess_input(input_data, model.input_encoding, input_params)
+    if timings:
+        timings.width, timings.height = encoding["width"], encoding["height"]
+    return input_data, {"input": encoding}
+
+def control_source(scene, model):
+    # Control map made locally from the render ('DEPTH', 'MIST', 'EDGES'), or None to let the model preprocess it
+    source = scene.replicate_control_source
+    if model is None or not model.control_maps or source not in model.control_maps:
+        return None
+    return source
+
+def apply_control_source(scene, model, input_params):
+    # Tell the model which kind of control map it gets
+    source = control_source(scene, model)
+    return dict(input_params, **model.control_maps[source]) if source else input_params
+
+def render_inputs(scene, model=None, timings=None):
+    """Render the current frame; returns its encoded image and, for a pass-based control source, the control map."""
+    from .capture import capture_render, capture_render_with_control
+
+    source = control_source(scene, model)
+    if source is None:
+        return capture_render(scene, timings), None
+    return capture_render_with_control(scene, source, timings)
+
+def read_frame(scene, frame, use_existing_frames=False, timings=None, model=None):
+    # Encoded image of one frame, read from the render output path or rendered now, and its control map if any
+    if use_existing_frames:
+        input_path = scene.render.frame_path(frame=frame)
+        if not os.path.exists(input_path):
+            raise FileNotFoundError(f"Image not found at {input_path}")
+        with open(input_path, "rb") as f:
+            return f.read(), None
+
+    scene.frame_set(frame)
+    return render_inputs(scene, model, timings)
+
+def frame_hash(input_data):
+    # Perceptual hash of an encoded frame, for spotting unchanged and near-duplicate renders
+    from .perceptual import dhash
+    from .pixels import decode_image_array
+
+    return dhash(decode_image_array(input_data))
+
+def fix_seed(input_params):
+    # Frames sharing one prediction must look like their neighbours, so a random seed becomes one fixed seed
+    if input_params.get("seed") == 0:
+        input_params = dict(input_params, seed=random.randint(1, 2 ** 31 - 1))
+    return input_params
+
+def preview_params(model, input_params):
+    # Fewer steps, and no optional outputs: the preview only has to show where the result is going
+    preview = model.preview
+    input_params = dict(input_params, **(preview.params or {}))
+    input_params[preview.steps_param] = min(input_params.get(preview.steps_param, preview.steps), preview.steps)
+    if model.extra_outputs_param:
+        input_params[model.extra_outputs_param] = False
+    return input_params
+
+def preview_input(model, input_data, timings=None):
+    from .capture import preprocess_input
+
+    with timings.stage("preprocess") if timings else nullcontext():
+        return preprocess_input(input_data, InputEncoding("webp", 85, max_size=model.preview.max_size), {})
+
+def request_outputs(scene, model, input_params):
+    """Return the input params and output names to fetch; optional outputs such as the control map come
+    in the same prediction when the scene asks for them."""
+    if not scene.replicate_return_preprocessed_image:
+        return input_params, ("result",)
+    if model.extra_outputs_param:
+        input_params = dict(input_params, **{model.extra_outputs_param: True})
+    return input_params, tuple(output.name for output in model.outputs)
+
+def fan_out(output_path, destinations):
+    for destination in destinations:
+        shutil.copyfile(output_path, destination)
+    return len(destinations)
+
+def resolve_output_dir(filepath):
+    output_dir = os.path.dirname(bpy.path.abspath(filepath))
+    if not output_dir:
+        output_dir = bpy.path.abspath("//")  # Get the directory of the current .blend file
+    if not output_dir:
+        output_dir = tempfile.gettempdir()  # Fall back to system temp directory if no .blend file is saved
+    return output_dir
+
+def output_name(filepath):
+    # Outputs are named after the render output path; "render" when it names only a directory
+    return os.path.splitext(os.path.basename(filepath))[0] or "render"
+
+def frame_output_path(output_dir, name, frame, output_format):
+    return os.path.join(output_dir, f"{name}_ai_{frame:04d}.{output_format}")
 
 class ReplicateImageToImageOperator(bpy.types.Operator):
     bl_idname = "render.replicate_image_to_image"
@@ -25,14 +152,26 @@ class ReplicateImageToImageOperator(bpy.types.Operator):
             scene = context.scene
             preferences = context.preferences.addons[__package__].preferences
 
-            if not preferences.api_key:
-                self.report({'ERROR'}, "Replicate API key not set. Please set it in the add-on preferences.")
+            api_key = preferences.api_key
+
+            if not dependencies_available():
+                self.report({'ERROR'}, MISSING_DEPENDENCIES_MESSAGE)
                 return {'CANCELLED'}
 
-            api_key = preferences.api_key
+            from .capture import capture_image
 
             # Determine if we're upscaling or using the original functionality
-            is_upscaling = context.area.type == 'IMAGE_EDITOR'
+            is_upscaling = context.area is not None and context.area.type == 'IMAGE_EDITOR'
+            # Use Clarity Upscaler for upscaling, the selected model otherwise
+            selected_model = apply_provider(scene, clarity_upscaler) if is_upscaling else get_selected_model(scene)
+            if needs_api_key(selected_model, api_key):
+                self.report({'ERROR'}, "Replicate API key not set. Please set it in the add-on preferences.")
+                return {'CANCELLED'}
+            timings = JobTimings(None)
+            control_data = None
+            self._preview = None
+            self._preview_image = None
+            self._watched = None
 
             if is_upscaling:
                 # Use the current image in the Image Editor
@@ -41,39 +180,17 @@ class ReplicateImageToImageOperator(bpy.types.Operator):
                     self.report({'ERROR'}, "No image selected in Image Editor")
                     return {'CANCELLED'}
                 
-                # Save the current image to a temporary file
-                with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp_file:
-                    temp_path = temp_file.name
-                image.save_render(temp_path)
+                with timings.stage("encode"):
+                    input_data = capture_image(image)
             else:
-                # Create a temporary file to save the render
-                with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp_file:
-                    temp_path = temp_file.name
-
-                # Store the original render path
+                # Render and capture the result once; the render filepath is not touched
                 original_path = scene.render.filepath
-
-                # Set the render path to our temporary file
-                scene.render.filepath = temp_path
-
-                # Render the image
-                bpy.ops.render.render(write_still=True)
-
-                # Restore the original render path
-                scene.render.filepath = original_path
-
-            # Check if the file exists
-            if not os.path.exists(temp_path):
-                raise FileNotFoundError(f"Image not found at {temp_path}")
-            
-            # Create a new Replicate client with the API key
-            client = replicate.Client(api_token=api_key)
+                # Tiles are each sent with their own render as control image
+                model = None if scene.replicate_tiled_processing else get_selected_model(scene)
+                input_data, control_data = render_inputs(scene, model, timings)
 
             if is_upscaling:
-                # Use Clarity Upscaler for upscaling
-                selected_model = clarity_upscaler
                 input_params = {
-                    "image": open(temp_path, "rb"),
                     "scale_factor": scene.upscale_scale_factor,
                     "prompt": scene.upscale_prompt,
                     "negative_prompt": scene.upscale_negative_prompt,
@@ -85,117 +202,476 @@ class ReplicateImageToImageOperator(bpy.types.Operator):
                     "resemblance": scene.upscale_resemblance,
                 }
             else:
-                # Get the selected model for the original functionality
-                selected_model = next((model for model in available_models if model.name == scene.replicate_model), None)
-                if not selected_model:
-                    raise ValueError(f"Selected model '{scene.replicate_model}' not found")
-
-                # Prepare input parameters
-                input_params = {}
-                for param in selected_model.parameters:
-                    if param.name not in ["control_image", "mask"]:  # Skip both control_image and mask parameters
-                        param_value = getattr(scene, f"replicate_{param.name}")
-                        if param.type == "enum" and param.name in ["tiling_width", "tiling_height"]:
-                            param_value = int(param_value)
-                        input_params[param.name] = param_value
-
-                # Handle the image parameter differently for each model
-                if selected_model.name == "Clarity Upscaler":
-                    input_params["image"] = open(temp_path, "rb")
-                elif selected_model.name == "Control Net":
-                    input_params["image"] = open(temp_path, "rb")
-                    input_params["control_image"] = open(temp_path, "rb")  # Use the rendered image as control image
-                elif selected_model.name == "Flux Control Net":
-                    input_params["image"] = open(temp_path, "rb")
-                    input_params["control_image"] = open(temp_path, "rb")
-
-            # Run the Replicate model
-            output = client.run(
-                selected_model.model_id,
-                input=input_params
-            )
-
-            # Process the output
-            if isinstance(output, list):
-                if selected_model.name == "Control Net":
-                    # For Control Net, always use the second image (index 1)
-                    image_url = output[1] if len(output) > 1 else None
-                else:
-                    # For other models, use the first image
-                    image_url = output[0] if output else None
-            else:
-                image_url = output
-            
+                input_params = build_input_params(scene, selected_model)
+            outputs = ("result",)
+
+            use_preview = scene.replicate_progressive_preview and not is_upscaling and selected_model.preview is not None
+            if use_preview:
+                # The full job is abandoned if these change before it finishes
+                self._watched = self.watched_state(scene)
+                # Preview and full run share one seed, so the preview shows the same image
+                input_params = fix_seed(input_params)
+
             # Determine the output path
-            if is_upscaling:
-                output_dir = os.path.dirname(bpy.path.abspath(image.filepath))
-                original_filename = os.path.basename(image.filepath)
-            else:
-                output_dir = os.path.dirname(bpy.path.abspath(original_path))
-                original_filename = os.path.basename(original_path)
-
-            if not output_dir:
-                output_dir = bpy.path.abspath("//")  # Get the directory of the current .blend file
-            if not output_dir:
-                output_dir = tempfile.gettempdir()  # Fall back to system temp directory if no .blend file is saved
-            
+            source_path = image.filepath if is_upscaling else original_path
+            output_dir = resolve_output_dir(source_path)
             # Use the original filename with a suffix
-            name, ext = os.path.splitext(original_filename)
-            output_format = scene.replicate_output_format if hasattr(scene, 'replicate_output_format') else 'png'
+            name = output_name(source_path)
+            output_format = input_params.get("output_format", "png")
             output_filename = f"{name}_{'upscaled' if is_upscaling else 'ai'}.{output_format}"
             ai_output_path = os.path.join(output_dir, output_filename)
-            
-            # Ensure the output directory exists
-            os.makedirs(output_dir, exist_ok=True)
-            
-            # Download the image from the URL and save it
-            response = requests.get(image_url)
-            if response.status_code == 200:
-                with open(ai_output_path, 'wb') as f:
-                    f.write(response.content)
-                self.report({'INFO'}, f"Processed image saved: {ai_output_path}")
-                self.open_image_in_new_window(ai_output_path)
+
+            # Upload, prediction and download run on a worker thread; modal() picks up the result
+            timings.model = selected_model.name
+            cache = get_result_cache(preferences)
+            timeout = get_job_timeout(preferences)
+            # With a preview the full job runs behind it, and behind any newer preview
+            priority = BATCH if use_preview else INTERACTIVE
+            if scene.replicate_tiled_processing:
+                if use_preview:
+                    self._preview = self.submit_preview(api_key, selected_model, input_params, input_data, None, ai_output_path, cache, timeout)
+                self._job = self.submit_tiles(scene, api_key, selected_model, input_params, input_data, ai_output_path, cache, timeout, timings,
+                                              priority)
             else:
-                raise RuntimeError(f"Failed to download the processed image. Status code: {response.status_code}")
+                if not is_upscaling:
+                    input_params, outputs = request_outputs(scene, selected_model, input_params)
+                if control_data is not None:
+                    input_params = apply_control_source(scene, selected_model, input_params)
+                if use_preview:
+                    self._preview = self.submit_preview(api_key, selected_model, input_params, input_data, control_data, ai_output_path, cache,
+                                                        timeout)
+                if control_data is not None:
+                    control_data, _ = prepare_input(selected_model, input_params, control_data, preferences.preprocess_inputs, timings)
+                input_data, meta = prepare_input(selected_model, input_params, input_data, preferences.preprocess_inputs, timings)
+                self._job = Job(api_key, selected_model, input_params, input_data, ai_output_path, cache=cache, meta=meta,
+                                store=get_job_store(), timeout=timeout, timings=timings, outputs=outputs,
+                                control_data=control_data, priority=priority).submit()
 
         except Exception as e:
             self.report({'ERROR'}, f"Error processing image: {str(e)}")
             return {'CANCELLED'}
-        finally:
-            # Clean up the temporary file
-            if 'temp_path' in locals():
-                try:
-                    os.unlink(temp_path)
-                except Exception as e:
-                    self.report({'WARNING'}, f"Failed to delete temporary file: {str(e)}")
 
+        wm = context.window_manager
+        wm.progress_begin(0, 100)
+        self._timer = wm.event_timer_add(0.5, window=context.window)
+        wm.modal_handler_add(self)
+        self.report({'INFO'}, f"Processing with {self._job.model.name}...")
+        return {'RUNNING_MODAL'}
+
+    def submit_preview(self, api_key, model, input_params, input_data, control_data, output_path, cache, timeout):
+        timings = JobTimings(model.name)
+        input_params = preview_params(model, input_params)
+        input_data, encoding = preview_input(model, input_data, timings)
+        if control_data is not None:
+            control_data, _ = preview_input(model, control_data, timings)
+        root, ext = os.path.splitext(output_path)
+        return Job(api_key, model, input_params, input_data, f"{root}_preview{ext}", cache=cache, meta={"input": encoding, "preview": True},
+                   timeout=timeout, timings=timings, control_data=control_data).submit()
+
+    def watched_state(self, scene):
+        model = get_model(scene.replicate_model)
+        if model is None:
+            return None
+        return model.name, build_input_params(scene, model), scene.replicate_control_source
+
+    def submit_tiles(self, scene, api_key, model, input_params, input_data, output_path, cache, timeout, timings, priority=INTERACTIVE):
+        from .capture import encode_png
+        from .pixels import decode_image_array
+        from .tiling import tile_boxes, split
+
+        pixels = decode_image_array(input_data)
+        height, width = pixels.shape[:2]
+        timings.width, timings.height = width, height
+        overlap = scene.replicate_tile_overlap
+        boxes = tile_boxes(width, height, scene.replicate_tile_size, overlap)
+
+        # Tile outputs stay in memory (output_path=None) and are decoded straight from the downloaded bytes
+        jobs = [
+            Job(api_key, model, input_params, encode_png(tile, w, h), None, cache=cache, timeout=timeout, priority=priority)
+            for tile, (x, y, w, h) in zip(split(pixels, boxes), boxes)
+        ]
+        return TiledJob(jobs, boxes, width, height, overlap, output_path, timings).submit()
+
+    def assemble_tiles(self, tile_data):
+        from .pixels import array_to_image, decode_image_array, save_image
+        from .tiling import blend
+
+        job = self._job
+        tiles = [decode_image_array(data) for data in tile_data]
+        # Scale is whatever the model actually produced, e.g. Clarity's scale_factor
+        scale = tiles[0].shape[1] / job.boxes[0][2]
+        pixels = blend(tiles, job.boxes, job.width, job.height, scale, job.overlap)
+
+        # The assembled image is written out and shown from memory, it is never read back from disk. An earlier
+        # result at the same path is overwritten in place, so the gallery and viewer never hold a stale copy
+        image = array_to_image(pixels, image=gallery.find_image(job.output_path), name=os.path.basename(job.output_path))
+        os.makedirs(os.path.dirname(job.output_path), exist_ok=True)
+        save_image(image, job.output_path)
+        return image
+
+    def modal(self, context, event):
+        if event.type == 'TIMER':
+            if self._job.done:
+                return self.finish(context)
+            if self._preview is not None and self._preview.done:
+                self.show_preview()
+            if self._watched is not None and self.watched_state(context.scene) != self._watched:
+                return self.abandon(context)
+            self.update_progress(context)
+        return {'PASS_THROUGH'}
+
+    def show_preview(self):
+        preview, self._preview = self._preview, None
+        try:
+            output_path = preview.result()
+        except JobCancelled:
+            return
+        except Exception as e:
+            self.report({'WARNING'}, f"Preview failed, still waiting for the full result: {str(e)}")
+            return
+        profiling.emit(preview.id, preview.timings)
+
+        # An earlier preview may have left this file loaded
+        image = gallery.find_image(output_path)
+        if image is None:
+            image = bpy.data.images.load(output_path)
+        else:
+            image.reload()
+        self._preview_image = image.name
+        gallery.show_in_viewer(image)
+        self.report({'INFO'}, "Preview ready, the full-quality result follows")
+
+    def drop_preview_image(self):
+        image = bpy.data.images.get(self._preview_image) if self._preview_image else None
+        if image is not None and image.users <= 1 and not image.use_fake_user:
+            bpy.data.images.remove(image)
+        self._preview_image = None
+
+    def abandon(self, context):
+        # Parameters changed: the full result would be stale, so stop paying for it
+        self._job.cancel()
+        if self._preview is not None:
+            self._preview.cancel()
+        self.end_modal(context)
+        self.report({'WARNING'}, "Parameters changed, full-quality job cancelled")
+        return {'CANCELLED'}
+
+    def end_modal(self, context):
+        wm = context.window_manager
+        wm.event_timer_remove(self._timer)
+        wm.progress_end()
+        context.workspace.status_text_set(None)
+        self._timer = None
+
+    def update_progress(self, context):
+        if self._job.progress is None:
+            return
+        done, total = self._job.progress
+        if isinstance(self._job, TiledJob):
+            context.window_manager.progress_update(int(done * 100 / total))
+            context.workspace.status_text_set(f"Neural Render: {done} / {total} tiles processed")
+        elif total:
+            context.window_manager.progress_update(int(done * 100 / total))
+            context.workspace.status_text_set(f"Neural Render: downloading {done / 1048576:.1f} / {total / 1048576:.1f} MB")
+        else:
+            context.workspace.status_text_set(f"Neural Render: downloading {done / 1048576:.1f} MB")
+
+    def finish(self, context):
+        self.end_modal(context)
+        if self._preview is not None:
+            self._preview.cancel()  # The full result is in; a preview still running is of no use
+        ai_output_path = self._job.output_path
+        try:
+            result = self._job.result()
+            with self._job.timings.stage("load"):
+                if isinstance(self._job, TiledJob):
+                    gallery.add(ai_output_path, image=self.assemble_tiles(result))
+                else:
+                    # Extra outputs such as the control map become results of their own
+                    for name, path in self._job.output_paths.items():
+                        if name != "result":
+                            gallery.add(path)
+                    gallery.add(ai_output_path)
+                if not bpy.app.background:
+                    gallery.show(ai_output_path, get_gallery_budget(context.preferences.addons[__package__].preferences))
+                    self.drop_preview_image()  # Replaced in the viewer by the full result
+        except JobCancelled:
+            self.report({'WARNING'}, "Processing cancelled")
+            return {'CANCELLED'}
+        except Exception as e:
+            self.report({'ERROR'}, f"Error processing image: {str(e)}")
+            return {'CANCELLED'}
+
+        if isinstance(self._job, TiledJob):
+            self._job.timings.merge_parallel(job.timings for job in self._job.jobs)
+        profiling.emit(self._job.id, self._job.timings)
+
+        if self._job.cache_hit:
+            self.report({'INFO'}, f"Loaded cached result: {ai_output_path}")
+        else:
+            self.report({'INFO'}, f"Processed image saved: {ai_output_path}")
+        if len(getattr(self._job, "output_paths", {})) > 1:
+            extras = [name.replace("_", " ") for name in self._job.output_paths if name != "result"]
+            self.report({'INFO'}, f"Also added to the results: {', '.join(extras)}")
         return {'FINISHED'}
 
-    def open_image_in_new_window(self, image_path):
-        # Load the image
-        image = bpy.data.images.load(image_path)
-        
-        # Create a new window
-        bpy.ops.screen.new()
-        
-        # Get the new window and change its type to IMAGE_EDITOR
-        for window in bpy.context.window_manager.windows:
-            if window.screen.name == 'temp':
-                for area in window.screen.areas:
-                    if area.type == 'VIEW_3D':
-                        area.type = 'IMAGE_EDITOR'
-                        for space in area.spaces:
-                            if space.type == 'IMAGE_EDITOR':
-                                space.image = image
-                        break
-                break
-        
-        self.report({'INFO'}, f"Processed image opened in a new window")
+class FrameBatch:
+    """Processes frames in order with up to max_jobs predictions in flight, shared by the frame range operator and the CLI.
+
+    Callers tick step() from the main thread, which renders, so only they differ in how often it runs and where
+    log(level, message) goes. Near-duplicate frames of a group reuse the output of its leader. entries holds the
+    outcome of every frame.
+    """
+
+    def __init__(self, scene, model, api_key, input_params, outputs, frames, output_dir, name, cache=None, timeout=None,
+                 preprocess=True, max_jobs=4, groups=None, use_existing_frames=False, log=None):
+        self.scene = scene
+        self.model = model
+        self.api_key = api_key
+        self.input_params = input_params
+        self.outputs = outputs
+        self.output_dir = output_dir
+        self.name = name
+        self.output_format = input_params.get("output_format", "png")
+        self.cache = cache
+        self.timeout = timeout
+        self.preprocess = preprocess
+        self.max_jobs = max_jobs
+        self.groups = groups  # FrameGroups, or None to process every frame
+        self.use_existing_frames = use_existing_frames
+        self.log = log or (lambda level, message: print(f"Neural Render: {message}"))
+        self.total = len(frames)
+        self.entries = {frame: {"frame": frame, "status": "pending", "output": None, "error": None} for frame in frames}
+        self._pending = list(frames)
+        self._in_flight = []
+
+    @property
+    def done(self):
+        return not self._pending and not self._in_flight
+
+    def count(self, status):
+        return sum(entry["status"] == status for entry in self.entries.values())
+
+    @property
+    def reused(self):
+        return sum(entry.get("reused_from") is not None for entry in self.entries.values())
+
+    def output_path(self, frame):
+        return frame_output_path(self.output_dir, self.name, frame, self.output_format)
+
+    def step(self):
+        """Collect finished jobs, then prepare and submit at most one frame; returns whether a frame was taken."""
+        for frame, job in [entry for entry in self._in_flight if entry[1].done]:
+            self._in_flight.remove((frame, job))
+            self._collect(frame, job)
+
+        # One frame per step, so the UI stays responsive while earlier frames are in flight
+        if not self._pending or len(self._in_flight) >= self.max_jobs:
+            return False
+        frame = self._pending.pop(0)
+        try:
+            job = self._submit(frame)
+            if job is not None:
+                self._in_flight.append((frame, job))
+        except Exception as e:
+            self._fail(frame, e)
+        return True
+
+    def cancel(self):
+        # Stop submitting and cancel the remote predictions still in flight
+        self._pending.clear()
+        for frame, job in self._in_flight:
+            job.cancel()
+
+    def _submit(self, frame):
+        timings = JobTimings(self.model.name)
+        input_data, control_data = read_frame(self.scene, frame, self.use_existing_frames, timings, self.model)
+
+        if self.groups is not None:
+            leader = self.groups.leader_for(frame, frame_hash(input_data))
+            if leader is not None:
+                # Near-duplicate of an earlier frame: reuse its output instead of running a prediction
+                if self.entries[leader]["status"] == "succeeded":
+                    self._reuse(leader, [frame])
+                return None
+
+        if control_data is not None:
+            control_data, _ = prepare_input(self.model, self.input_params, control_data, self.preprocess, timings)
+        input_data, meta = prepare_input(self.model, self.input_params, input_data, self.preprocess, timings)
+        return Job(self.api_key, self.model, self.input_params, input_data, self.output_path(frame), self.cache, meta=meta,
+                   store=get_job_store(), timeout=self.timeout, timings=timings, outputs=self.outputs,
+                   control_data=control_data, priority=BATCH).submit()
+
+    def _collect(self, frame, job):
+        try:
+            output = job.result()
+        except JobCancelled as e:
+            self._fail(frame, e, report=False)
+            return
+        except Exception as e:
+            self._fail(frame, e)
+            return
+        self.entries[frame].update(status="succeeded", output=output, outputs=job.output_paths, cache_hit=job.cache_hit,
+                                   meta=job.meta, timings=profiling.emit(job.id, job.timings))
+        self.log('INFO', f"Frame {frame} saved: {job.output_path}")
+        if self.groups is not None:
+            self._reuse(frame, self.groups.followers[frame])
+
+    def _reuse(self, leader, followers):
+        for frame in followers:
+            try:
+                fan_out(self.entries[leader]["output"], [self.output_path(frame)])
+                self.entries[frame].update(status="succeeded", output=self.output_path(frame), reused_from=leader)
+            except Exception as e:
+                self.entries[frame].update(status="failed", error=str(e))
+                self.log('WARNING', f"Frame {frame} failed: {str(e)}")
+
+    def _fail(self, frame, error, report=True):
+        self.entries[frame].update(status="failed", error=str(error))
+        if report:
+            self.log('WARNING', f"Frame {frame} failed: {str(error)}")
+        # Frames waiting on a failed leader fail with it; a frame may lead a group before its job was submitted
+        for follower in self.groups.drop(frame) if self.groups is not None else []:
+            self.entries[follower].update(status="failed", error=f"Frame {frame} it duplicates failed: {str(error)}")
+
+class ReplicateFrameRangeOperator(bpy.types.Operator):
+    bl_idname = "render.replicate_frame_range"
+    bl_label = "Process Frame Range"
+    bl_description = "Process every frame of the scene frame range using the selected AI model"
+
+    use_existing_frames: bpy.props.BoolProperty(
+        name="Use Existing Frames",
+        description="Read already rendered frames from the output path instead of rendering them",
+        default=False
+    )
+
+    def execute(self, context):
+        scene = context.scene
+        preferences = context.preferences.addons[__package__].preferences
+
+        if not dependencies_available():
+            self.report({'ERROR'}, MISSING_DEPENDENCIES_MESSAGE)
+            return {'CANCELLED'}
+
+        try:
+            model = get_selected_model(scene)
+            if needs_api_key(model, preferences.api_key):
+                self.report({'ERROR'}, "Replicate API key not set. Please set it in the add-on preferences.")
+                return {'CANCELLED'}
+            input_params, outputs = request_outputs(scene, model, build_input_params(scene, model))
+            if not self.use_existing_frames:
+                input_params = apply_control_source(scene, model, input_params)
+        except Exception as e:
+            self.report({'ERROR'}, f"Error processing frames: {str(e)}")
+            return {'CANCELLED'}
+
+        groups = None
+        if scene.replicate_skip_duplicate_frames:
+            from .perceptual import FrameGroups
+
+            groups = FrameGroups(scene.replicate_duplicate_threshold)
+            input_params = fix_seed(input_params)
+
+        self._batch = FrameBatch(
+            scene, model, preferences.api_key, input_params, outputs,
+            list(range(scene.frame_start, scene.frame_end + 1, scene.frame_step)),
+            resolve_output_dir(scene.render.filepath), output_name(scene.render.filepath),
+            cache=get_result_cache(preferences), timeout=get_job_timeout(preferences), preprocess=preferences.preprocess_inputs,
+            max_jobs=preferences.max_concurrent_jobs, groups=groups, use_existing_frames=self.use_existing_frames,
+            log=self.report_frame,
+        )
+
+        self._frame_current = scene.frame_current  # Rendering moves the timeline; finish() puts it back
+
+        wm = context.window_manager
+        wm.progress_begin(0, self._batch.total)
+        self._timer = wm.event_timer_add(0.2, window=context.window)
+        wm.modal_handler_add(self)
+        self.report({'INFO'}, f"Processing {self._batch.total} frames with {model.name}...")
+        return {'RUNNING_MODAL'}
+
+    def report_frame(self, level, message):
+        # Saved frames show up in the progress bar; only failures are worth a report
+        if level != 'INFO':
+            self.report({level}, message)
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            # Stop submitting and cancel the remote predictions still in flight
+            self._batch.cancel()
+            return self.finish(context, cancelled=True)
+
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        self._batch.step()
+        context.window_manager.progress_update(self._batch.count("succeeded") + self._batch.count("failed"))
+        if self._batch.done:
+            return self.finish(context)
+        return {'PASS_THROUGH'}
+
+    def finish(self, context, cancelled=False):
+        wm = context.window_manager
+        wm.event_timer_remove(self._timer)
+        wm.progress_end()
+        if context.scene.frame_current != self._frame_current:
+            context.scene.frame_set(self._frame_current)
+        batch = self._batch
+        reused = f", {batch.reused} reused from duplicate frames" if batch.reused else ""
+        self.report({'INFO'}, f"Processed {batch.count('succeeded')}/{batch.total} frames "
+                              f"({batch.count('failed')} failed{reused}) into {batch.output_dir}")
+        return {'CANCELLED'} if cancelled else {'FINISHED'}
+
+class CancelJobsOperator(bpy.types.Operator):
+    bl_idname = "render.neural_render_cancel_jobs"
+    bl_label = "Cancel Jobs"
+    bl_description = "Cancel every running Neural Render job, including its remote prediction"
+
+    @classmethod
+    def poll(cls, context):
+        return bool(live_jobs())
+
+    def execute(self, context):
+        count = cancel_all_jobs()
+        self.report({'INFO'}, f"Cancelling {count} job(s)")
+        return {'FINISHED'}
+
+class ShowResultOperator(bpy.types.Operator):
+    bl_idname = "image.neural_render_show_result"
+    bl_label = "Show Result"
+    bl_description = "Show this result at full resolution in the result viewer"
+
+    path: bpy.props.StringProperty(options={'HIDDEN', 'SKIP_SAVE'})
+
+    def execute(self, context):
+        if not os.path.exists(self.path):
+            self.report({'ERROR'}, f"Result file not found: {self.path}")
+            return {'CANCELLED'}
+        preferences = context.preferences.addons[__package__].preferences
+        gallery.show(self.path, get_gallery_budget(preferences))
+        return {'FINISHED'}
+
+class ClearResultsOperator(bpy.types.Operator):
+    bl_idname = "image.neural_render_clear_results"
+    bl_label = "Clear Results"
+    bl_description = "Remove every result from the list and unload the ones not on screen. Files on disk are kept"
+
+    def execute(self, context):
+        gallery.clear()
+        return {'FINISHED'}
 
 def register():
     bpy.utils.register_class(ReplicateImageToImageOperator)
+    bpy.utils.register_class(ReplicateFrameRangeOperator)
+    bpy.utils.register_class(CancelJobsOperator)
+    bpy.utils.register_class(ShowResultOperator)
+    bpy.utils.register_class(ClearResultsOperator)
 
 def unregister():
+    bpy.utils.unregister_class(ClearResultsOperator)
+    bpy.utils.unregister_class(ShowResultOperator)
+    bpy.utils.unregister_class(CancelJobsOperator)
+    bpy.utils.unregister_class(ReplicateFrameRangeOperator)
     bpy.utils.unregister_class(ReplicateImageToImageOperator)
 
 if __name__ == "__main__":
@@ -1,5 +1,21 @@
 import bpy
-from .models import available_models, ModelParameter
+from .models import get_model, LOCAL
+from .properties import get_model_settings, get_parameter_names
+from . import gallery
+from . import profiling
+
+def draw_results(layout):
+    results = gallery.results()
+    if not results:
+        layout.label(text="No results yet")
+        return
+    layout.operator("image.neural_render_clear_results", icon='TRASH')
+    grid = layout.grid_flow(row_major=True, columns=3, even_columns=True)
+    for path, label, _ in results:
+        col = grid.column(align=True)
+        # Only the preview is drawn; the full image is loaded when the result is shown
+        col.template_icon(icon_value=gallery.preview_icon(path), scale=5.0)
+        col.operator("image.neural_render_show_result", text=label).path = path
 
 class ReplicateImageToImagePanel(bpy.types.Panel):
     bl_label = "Neural Render"
@@ -14,18 +30,86 @@ class ReplicateImageToImagePanel(bpy.types.Panel):
 
         layout.prop(scene, "replicate_model")
 
-        selected_model = next((model for model in available_models if model.name == scene.replicate_model), None)
+        selected_model = get_model(scene.replicate_model)
         if selected_model:
-            for param in selected_model.parameters:
-                if param.name not in ["control_image", "mask"]:  # Skip both control_image and mask parameters
-                    if param.type == "enum":
-                        layout.prop(scene, f"replicate_{param.name}")
-                    elif param.type == "bool":
-                        layout.prop(scene, f"replicate_{param.name}")
-                    else:
-                        layout.prop(scene, f"replicate_{param.name}")
-
+            settings = get_model_settings(scene, selected_model)
+            layout.prop(settings, "provider")
+            if settings.provider == LOCAL:
+                layout.prop(settings, "server_url")
+            for name in get_parameter_names(selected_model):
+                layout.prop(settings, name)
+            if selected_model.control_maps:
+                layout.prop(scene, "replicate_control_source")
+            if any(output.optional for output in selected_model.outputs):
+                layout.prop(scene, "replicate_return_preprocessed_image")
+
+        box = layout.box()
+        box.prop(scene, "replicate_tiled_processing")
+        col = box.column()
+        col.active = scene.replicate_tiled_processing
+        col.prop(scene, "replicate_tile_size")
+        col.prop(scene, "replicate_tile_overlap")
+
+        box = layout.box()
+        box.prop(scene, "replicate_skip_duplicate_frames")
+        col = box.column()
+        col.active = scene.replicate_skip_duplicate_frames
+        col.prop(scene, "replicate_duplicate_threshold")
+
+        row = layout.row()
+        row.active = selected_model is not None and selected_model.preview is not None
+        row.prop(scene, "replicate_progressive_preview")
+        layout.prop(scene, "replicate_auto_process")
         layout.operator("render.replicate_image_to_image", text="Process Image")
+        layout.operator("render.replicate_frame_range", text="Process Frame Range")
+        layout.operator("render.neural_render_cancel_jobs", icon='CANCEL')
+
+class NeuralRenderPerformancePanel(bpy.types.Panel):
+    bl_label = "Performance"
+    bl_idname = "RENDER_PT_neural_render_performance"
+    bl_parent_id = "RENDER_PT_replicate_image_to_image"
+    bl_space_type = 'PROPERTIES'
+    bl_region_type = 'WINDOW'
+    bl_context = "render"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        rows = profiling.summary()
+        if not rows:
+            layout.label(text="No jobs timed yet")
+            return
+
+        grid = layout.grid_flow(row_major=True, columns=4, even_columns=True, align=True)
+        for heading in ("Stage", "Jobs", "p50", "p95"):
+            grid.label(text=heading)
+        for stage, count, p50, p95 in rows:
+            grid.label(text=stage.capitalize())
+            grid.label(text=str(count))
+            grid.label(text=f"{p50 / 1000:.2f} s")
+            grid.label(text=f"{p95 / 1000:.2f} s")
+
+class NeuralRenderResultsPanel(bpy.types.Panel):
+    bl_label = "Results"
+    bl_idname = "RENDER_PT_neural_render_results"
+    bl_parent_id = "RENDER_PT_replicate_image_to_image"
+    bl_space_type = 'PROPERTIES'
+    bl_region_type = 'WINDOW'
+    bl_context = "render"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        draw_results(self.layout)
+
+class ResultViewerPanel(bpy.types.Panel):
+    bl_label = "Neural Render Results"
+    bl_idname = "IMAGE_PT_neural_render_results"
+    bl_space_type = 'IMAGE_EDITOR'
+    bl_region_type = 'UI'
+    bl_category = "Neural Render"
+
+    def draw(self, context):
+        draw_results(self.layout)
 
 class UpscaleImagePanel(bpy.types.Panel):
     bl_label = "Upscale Image"
@@ -65,41 +149,29 @@ class UpscaleRenderResultPanel(bpy.types.Panel):
 class OpenLastRenderOperator(bpy.types.Operator):
     bl_idname = "render.open_last_render"
     bl_label = "Open Last Render"
-    bl_description = "Open the last rendered image in a new window"
+    bl_description = "Open the last rendered image in the result viewer"
 
     def execute(self, context):
-        last_render = bpy.data.images['Render Result']
+        last_render = bpy.data.images.get('Render Result')
         if last_render:
-            self.open_image_in_new_window(last_render)
+            gallery.show_in_viewer(last_render)
         else:
             self.report({'ERROR'}, "No render result available")
         return {'FINISHED'}
 
-    def open_image_in_new_window(self, image):
-        # Create a new window
-        bpy.ops.screen.new()
-        
-        # Get the new window and change its type to IMAGE_EDITOR
-        for window in bpy.context.window_manager.windows:
-            if window.screen.name == 'temp':
-                for area in window.screen.areas:
-                    if area.type == 'VIEW_3D':
-                        area.type = 'IMAGE_EDITOR'
-                        for space in area.spaces:
-                            if space.type == 'IMAGE_EDITOR':
-                                space.image = image
-                        break
-                break
-        
-        self.report({'INFO'}, f"Render result opened in a new window")
-
 def register():
     bpy.utils.register_class(ReplicateImageToImagePanel)
+    bpy.utils.register_class(NeuralRenderPerformancePanel)
+    bpy.utils.register_class(NeuralRenderResultsPanel)
+    bpy.utils.register_class(ResultViewerPanel)
     bpy.utils.register_class(UpscaleImagePanel)
     bpy.utils.register_class(UpscaleRenderResultPanel)
     bpy.utils.register_class(OpenLastRenderOperator)
 
 def unregister():
+    bpy.utils.unregister_class(ResultViewerPanel)
+    bpy.utils.unregister_class(NeuralRenderResultsPanel)
+    bpy.utils.unregister_class(NeuralRenderPerformancePanel)
     bpy.utils.unregister_class(ReplicateImageToImagePanel)
     bpy.utils.unregister_class(UpscaleImagePanel)
     bpy.utils.unregister_class(UpscaleRenderResultPanel)
@@ -0,0 +1,15 @@
+import os
+
+import bpy
+
+# Where the add-on keeps its own files (job store, cache, timing log). Created on first use, never in register().
+
+def user_directory(path=""):
+    # Installed as an extension the add-on has its own user directory; a legacy add-on install
+    # (bl_info, outside bl_ext) has none and uses a folder in Blender's config directory instead
+    try:
+        return bpy.utils.extension_path_user(__package__, path=path, create=True)
+    except ValueError:
+        directory = os.path.join(bpy.utils.user_resource('CONFIG', path=__package__.rpartition(".")[2]), path)
+        os.makedirs(directory, exist_ok=True)
+        return directory
@@ -0,0 +1,58 @@
+import numpy as np
+
+# Cheap perceptual fingerprints of rendered frames, robust to render noise. Arrays are
+# (height, width, 4) float32 as returned by pixels.image_to_array; nothing here touches bpy.
+
+HASH_SIZE = 16  # 16x16 gradient bits = 256-bit hash
+
+LUMA = np.array([0.2126, 0.7152, 0.0722], dtype=np.float32)
+
+def luminance(pixels):
+    return pixels[..., :3] @ LUMA
+
+def downsample(gray, width, height):
+    """Area-average a 2D array down to (height, width) blocks."""
+    rows = np.linspace(0, gray.shape[0], height + 1).astype(int)[:-1]
+    cols = np.linspace(0, gray.shape[1], width + 1).astype(int)[:-1]
+    sums = np.add.reduceat(np.add.reduceat(gray, rows, axis=0), cols, axis=1)
+    counts = np.outer(np.diff(np.append(rows, gray.shape[0])), np.diff(np.append(cols, gray.shape[1])))
+    return sums / counts
+
+def dhash(pixels, size=HASH_SIZE, tolerance=1 / 255):
+    """Difference hash: one bit per horizontally adjacent pair of blocks, set where brightness increases.
+
+    Steps smaller than tolerance count as flat, so noise in flat areas such as a clear sky does not flip bits.
+    """
+    small = downsample(luminance(pixels), size + 1, size)
+    bits = (small[:, 1:] - small[:, :-1] > tolerance).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+def distance(a, b):
+    """Number of differing bits between two hashes."""
+    return (a ^ b).bit_count()
+
+class FrameGroups:
+    """Groups frames of a sequence whose hashes are within threshold bits of a group's first frame, its leader.
+
+    Only leaders need a prediction; their output is reused for the other frames of the group.
+    """
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.followers = {}  # Leader frame -> frames reusing its output
+        self._leaders = []  # (hash, frame)
+
+    def leader_for(self, frame, frame_hash):
+        """Return the leader frame this frame duplicates, or None after making it a leader itself."""
+        for leader_hash, leader in self._leaders:
+            if distance(leader_hash, frame_hash) <= self.threshold:
+                self.followers[leader].append(frame)
+                return leader
+        self._leaders.append((frame_hash, frame))
+        self.followers[frame] = []
+        return None
+
+    def drop(self, leader):
+        # A failed leader stops attracting frames; returns the frames that were waiting on it
+        self._leaders = [(leader_hash, frame) for leader_hash, frame in self._leaders if frame != leader]
+        return self.followers.pop(leader, [])
@@ -0,0 +1,44 @@
+import bpy
+import numpy as np
+
+# Moving pixels between Blender images and NumPy. Arrays are contiguous float32 of shape
+# (height, width, 4), RGBA, in Blender's bottom-up row order. Main thread only.
+
+FILE_FORMATS = {"png": 'PNG', "jpg": 'JPEG', "jpeg": 'JPEG', "webp": 'WEBP', "exr": 'OPEN_EXR'}
+
+def image_to_array(image):
+    width, height = image.size
+    pixels = np.empty(width * height * 4, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    return pixels.reshape(height, width, 4)
+
+def array_to_image(pixels, image=None, name="Neural Render"):
+    """Write pixels into image, creating a new RGBA image (or resizing the given one) to match."""
+    height, width = pixels.shape[:2]
+    if image is None:
+        image = bpy.data.images.new(name, width, height, alpha=True)
+    elif tuple(image.size) != (width, height):
+        image.scale(width, height)
+    image.pixels.foreach_set(np.ascontiguousarray(pixels, dtype=np.float32).ravel())
+    image.update()
+    return image
+
+def image_from_bytes(data, name="Neural Render"):
+    """Decode encoded image bytes (PNG, JPEG, WebP, ...) into a new packed image, without touching disk."""
+    image = bpy.data.images.new(name, 1, 1)
+    image.pack(data=data, data_len=len(data))
+    image.source = 'FILE'
+    return image
+
+def decode_image_array(data):
+    image = image_from_bytes(data, "Neural Render Decode")
+    try:
+        return image_to_array(image)
+    finally:
+        bpy.data.images.remove(image)
+
+def save_image(image, path):
+    ext = path.rsplit(".", 1)[-1].lower()
+    image.filepath_raw = path
+    image.file_format = FILE_FORMATS.get(ext, 'PNG')
+    image.save()
@@ -0,0 +1,143 @@
+import threading
+import time
+
+from .scheduler import TokenBucket, backoff
+
+# Explicit prediction lifecycle against the Replicate HTTP API: create -> poll -> fetch, with cancel.
+# Runs on worker threads; no bpy here.
+
+API_URL = "https://api.replicate.com/v1"
+
+TERMINAL_STATES = ("succeeded", "failed", "canceled")
+
+POLL_INITIAL = 0.5  # Seconds; most short jobs finish within the first few polls
+POLL_MAX = 10.0
+POLL_BACKOFF = 1.5
+
+# Replicate allows 600 prediction creates and 3000 other requests per minute per token; stay a little below
+CREATE_RATE = 9.0  # Per second
+REQUEST_RATE = 45.0
+MAX_RETRIES = 5
+
+class APIError(RuntimeError):
+    def __init__(self, status, message, retry_after=None):
+        super().__init__(f"Replicate API error {status}: {message}")
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self):
+        return self.status == 429 or self.status >= 500
+
+class JobCancelled(Exception):
+    pass
+
+class JobTimeout(RuntimeError):
+    pass
+
+def _retry_after(response):
+    value = response.headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None  # HTTP-date form; fall back to our own backoff
+
+class ReplicateAPI:
+    """One per API key: the rate limits are per token, so every job using the key shares these buckets."""
+
+    def __init__(self, api_key, session, base_url=API_URL):
+        self.base_url = base_url
+        self.session = session
+        self.headers = {"Authorization": f"Bearer {api_key}"}
+        self.create_limit = TokenBucket(CREATE_RATE, burst=CREATE_RATE)
+        self.request_limit = TokenBucket(REQUEST_RATE, burst=REQUEST_RATE)
+
+    def _send(self, method, path, **kwargs):
+        response = self.session.request(method, f"{self.base_url}{path}", headers=self.headers, timeout=(10, 60), **kwargs)
+        if response.status_code >= 400:
+            try:
+                message = response.json().get("detail", response.text)
+            except ValueError:
+                message = response.text
+            raise APIError(response.status_code, message, _retry_after(response))
+        return response.json()
+
+    def _request(self, method, path, limit, retry_server_errors=True, **kwargs):
+        # Throttled (429) requests are always safe to retry; server errors and dropped connections only
+        # where repeating does no harm
+        import requests
+
+        for attempt in range(MAX_RETRIES + 1):
+            limit.acquire()
+            try:
+                return self._send(method, path, **kwargs)
+            except APIError as e:
+                retryable = e.status == 429 or (retry_server_errors and e.retryable)
+                if not retryable or attempt == MAX_RETRIES:
+                    raise
+                time.sleep(backoff(attempt, e.retry_after))
+            except (requests.ConnectionError, requests.Timeout):
+                if not retry_server_errors or attempt == MAX_RETRIES:
+                    raise
+                time.sleep(backoff(attempt))
+
+    def create(self, model_id, input_params):
+        # A 5xx or a dropped connection may still have created the prediction, so only throttling is retried here
+        version = model_id.split(":", 1)[1]
+        return self._request("POST", "/predictions", self.create_limit, retry_server_errors=False,
+                             json={"version": version, "input": input_params})
+
+    def get(self, prediction_id):
+        return self._request("GET", f"/predictions/{prediction_id}", self.request_limit)
+
+    def cancel(self, prediction_id):
+        return self._request("POST", f"/predictions/{prediction_id}/cancel", self.request_limit)
+
+def _cancel(api, prediction_id):
+    try:
+        api.cancel(prediction_id)
+    except Exception:
+        pass  # Best effort: the local job stops either way
+
+def poll(api, prediction, cancel_event=None, timeout=None):
+    """Poll until the prediction reaches a terminal state, backing off from POLL_INITIAL to POLL_MAX.
+
+    Setting cancel_event or exceeding timeout (seconds) cancels the remote prediction.
+    """
+    cancel_event = cancel_event or threading.Event()
+    deadline = time.monotonic() + timeout if timeout else None
+    interval = POLL_INITIAL
+    delay = interval
+
+    while prediction["status"] not in TERMINAL_STATES:
+        # Event.wait doubles as the sleep, so a cancel request takes effect immediately
+        if cancel_event.wait(delay):
+            _cancel(api, prediction["id"])
+            raise JobCancelled(f"Prediction {prediction['id']} was cancelled")
+        if deadline is not None and time.monotonic() > deadline:
+            _cancel(api, prediction["id"])
+            raise JobTimeout(f"Prediction {prediction['id']} timed out after {timeout:.0f} s")
+
+        try:
+            prediction = api.get(prediction["id"])
+        except APIError as e:
+            if not e.retryable:
+                raise
+            delay = max(e.retry_after or interval, interval)
+            continue
+
+        interval = min(interval * POLL_BACKOFF, POLL_MAX)
+        delay = interval
+
+    return prediction
+
+def is_transport_error(error):
+    """Whether error means the API or CDN could not be reached, rather than the prediction failing."""
+    import requests
+
+    return isinstance(error, (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError))
+
+def get_output(prediction):
+    if prediction["status"] != "succeeded":
+        raise RuntimeError(f"Prediction {prediction['id']} {prediction['status']}: {prediction.get('error')}")
+    return prediction["output"]
@@ -1,6 +1,17 @@
 import bpy
 from bpy.types import AddonPreferences
-from bpy.props import StringProperty
+from bpy.props import StringProperty, IntProperty, BoolProperty
+
+from . import clients
+from . import jobs
+from .dependencies import dependencies_available, install_dependencies, missing_packages
+
+def update_api_key(self, context):
+    # Drop pooled clients and remembered uploads that belong to the previous key
+    clients.reset()
+
+def update_max_jobs_per_model(self, context):
+    jobs.set_model_limit(self.max_jobs_per_model)
 
 class ReplicateAddonPreferences(AddonPreferences):
     bl_idname = __package__
@@ -8,9 +19,99 @@ class ReplicateAddonPreferences(AddonPreferences):
     api_key: StringProperty(
         name="Replicate API Key",
         description="Enter your Replicate API key",
-        subtype='PASSWORD'
+        subtype='PASSWORD',
+        update=update_api_key
+    )
+
+    max_concurrent_jobs: IntProperty(
+        name="Max Concurrent Jobs",
+        description="Maximum number of predictions in flight when processing a frame range",
+        default=4,
+        min=1,
+        max=16
+    )
+
+    max_jobs_per_model: IntProperty(
+        name="Max Jobs per Model",
+        description="Maximum number of predictions of one model running at once, across all batches and the Process Image button",
+        default=8,
+        min=1,
+        max=16,
+        update=update_max_jobs_per_model
+    )
+
+    job_timeout: IntProperty(
+        name="Job Timeout (minutes)",
+        description="Cancel a prediction that has not finished after this long. 0 waits indefinitely",
+        default=30,
+        min=0
+    )
+
+    preprocess_inputs: BoolProperty(
+        name="Preprocess Inputs",
+        description="Resize inputs to each model's effective resolution and encode them as WebP before upload",
+        default=True
+    )
+
+    use_cache: BoolProperty(
+        name="Cache Results",
+        description="Reuse stored outputs for identical inputs and parameters. Only used with a fixed (non-zero) seed",
+        default=True
+    )
+
+    cache_directory: StringProperty(
+        name="Cache Directory",
+        description="Where cached outputs are stored, in a neural_render_cache folder inside it. Leave empty to use the add-on's user directory",
+        subtype='DIR_PATH',
+        default=""
+    )
+
+    cache_max_size: IntProperty(
+        name="Max Cache Size (MB)",
+        description="Least recently used outputs are evicted once the cache grows past this size",
+        default=1024,
+        min=16
+    )
+
+    gallery_memory_budget: IntProperty(
+        name="Result Memory Budget (MB)",
+        description="Full-resolution results not on screen are unloaded, least recently viewed first, once they use more than this",
+        default=1024,
+        min=64
     )
 
     def draw(self, context):
         layout = self.layout
-        layout.prop(self, "api_key")
\ No newline at end of file
+        layout.prop(self, "api_key")
+
+        if not dependencies_available():
+            box = layout.box()
+            box.label(text=f"Missing packages: {', '.join(missing_packages())}", icon='ERROR')
+            box.operator("preferences.neural_render_install_dependencies", icon='IMPORT')
+
+        layout.prop(self, "max_concurrent_jobs")
+        layout.prop(self, "max_jobs_per_model")
+        layout.prop(self, "job_timeout")
+        layout.prop(self, "preprocess_inputs")
+        layout.prop(self, "use_cache")
+        col = layout.column()
+        col.active = self.use_cache
+        col.prop(self, "cache_directory")
+        col.prop(self, "cache_max_size")
+        layout.prop(self, "gallery_memory_budget")
+
+class InstallDependenciesOperator(bpy.types.Operator):
+    bl_idname = "preferences.neural_render_install_dependencies"
+    bl_label = "Install Dependencies"
+    bl_description = "Install the Python packages Neural Render needs into Blender's Python using pip"
+
+    def execute(self, context):
+        try:
+            if not install_dependencies():
+                self.report({'ERROR'}, "Some packages are still missing after installation. Please install them manually.")
+                return {'CANCELLED'}
+        except Exception as e:
+            self.report({'ERROR'}, f"Failed to install dependencies: {str(e)}")
+            return {'CANCELLED'}
+        self.report({'INFO'}, "Dependencies installed")
+        return {'FINISHED'}
@@ -0,0 +1,99 @@
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+# Per-stage timing of jobs. Stages are timed from both the main thread (render, encode, load) and the
+# worker (upload, queue, inference, download); finished records go to a JSONL log and rolling stats.
+
+STAGES = ["render", "encode", "preprocess", "upload", "queue", "inference", "download", "load"]
+
+ROLLING_WINDOW = 200
+
+_lock = threading.Lock()
+_log_path = None
+_samples = defaultdict(lambda: deque(maxlen=ROLLING_WINDOW))
+
+class JobTimings:
+    def __init__(self, model_name):
+        self.model = model_name
+        self.stages = {}
+        self.width = None
+        self.height = None
+        self.bytes_up = 0
+        self.bytes_down = 0
+        self.meta = {}  # The job's metadata, e.g. the input encoding used
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - start) * 1000.0)
+
+    def add(self, name, milliseconds):
+        self.stages[name] = self.stages.get(name, 0.0) + milliseconds
+
+    def merge_parallel(self, others):
+        # Stages that ran concurrently (e.g. tiles) cost as much as the slowest one; bytes add up
+        for other in others:
+            for name, ms in other.stages.items():
+                self.stages[name] = max(self.stages.get(name, 0.0), ms)
+            self.bytes_up += other.bytes_up
+            self.bytes_down += other.bytes_down
+
+    def as_record(self, job_id):
+        return {
+            "time": time.time(),
+            "job_id": job_id,
+            "model": self.model,
+            "width": self.width,
+            "height": self.height,
+            "bytes_up": self.bytes_up,
+            "bytes_down": self.bytes_down,
+            "meta": self.meta,
+            "stages_ms": {name: round(ms, 2) for name, ms in self.stages.items()},
+            "total_ms": round(sum(self.stages.values()), 2),
+        }
+
+def set_log_path(path):
+    """path is the JSONL file, or a callable returning it once the first record is written."""
+    global _log_path
+    _log_path = path
+
+def emit(job_id, timings):
+    global _log_path
+    record = timings.as_record(job_id)
+    with _lock:
+        for name, ms in record["stages_ms"].items():
+            _samples[name].append(ms)
+        _samples["total"].append(record["total_ms"])
+        if callable(_log_path):
+            try:
+                _log_path = _log_path()
+            except (OSError, ValueError):
+                _log_path = None  # No writable location; the rolling stats still work
+        if _log_path:
+            with open(_log_path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+    return record
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+def summary():
+    """[(stage, count, p50 ms, p95 ms)] over the rolling window, in pipeline order."""
+    with _lock:
+        samples = {name: list(values) for name, values in _samples.items() if values}
+    return [
+        (name, len(samples[name]), _percentile(samples[name], 0.5), _percentile(samples[name], 0.95))
+        for name in STAGES + ["total"] if name in samples
+    ]
+
+def reset():
+    with _lock:
+        _samples.clear()
@@ -0,0 +1,134 @@
+from dataclasses import replace
+
+import bpy
+
+from .models import available_models, REPLICATE, LOCAL
+
+# Each AIModel gets its own PropertyGroup, generated from its parameter list and reachable as
+# scene.neural_render.<model.key>, so models with the same parameter names no longer collide.
+
+SKIPPED_PARAMETERS = ["control_image", "mask"]  # Filled in from the render, never edited in the UI
+
+DEFAULT_SERVER_URL = "http://localhost:5000"  # Where Cog serves a model container by default
+
+def make_backend_properties(model):
+    # Stored next to the model's parameters but never sent to it
+    return {
+        "provider": bpy.props.EnumProperty(
+            name="Backend",
+            items=[
+                (REPLICATE, "Replicate", "Run predictions on Replicate"),
+                (LOCAL, "Local Server", "Run predictions on a self-hosted server running the model's Cog container"),
+            ],
+            default=model.provider,
+            description="Where predictions for this model run"
+        ),
+        "server_url": bpy.props.StringProperty(
+            name="Server URL",
+            default=DEFAULT_SERVER_URL,
+            description="Address of the inference server serving this model, e.g. a GPU machine on the local network"
+        ),
+    }
+
+_groups = []
+_accessors = {}
+
+def make_property(param):
+    name = param.name.replace("_", " ").title()
+    if param.type == "int":
+        return bpy.props.IntProperty(
+            name=name,
+            default=param.default,
+            description=param.description,
+            min=int(param.min) if param.min is not None else -2**31,
+            max=int(param.max) if param.max is not None else 2**31 - 1
+        )
+    elif param.type == "float":
+        return bpy.props.FloatProperty(
+            name=name,
+            default=param.default,
+            description=param.description,
+            min=param.min if param.min is not None else -float('inf'),
+            max=param.max if param.max is not None else float('inf')
+        )
+    elif param.type == "bool":
+        return bpy.props.BoolProperty(
+            name=name,
+            default=param.default,
+            description=param.description
+        )
+    elif param.type == "enum":
+        return bpy.props.EnumProperty(
+            name=name,
+            items=[(option, option, "") for option in param.options],
+            default=param.default,
+            description=param.description
+        )
+    else:  # string
+        return bpy.props.StringProperty(
+            name=name,
+            default=param.default,
+            description=param.description
+        )
+
+def make_accessors(model):
+    # (parameter name, converter) pairs, computed once per model instead of on every run
+    accessors = []
+    for param in model.parameters:
+        if param.name in SKIPPED_PARAMETERS:
+            continue
+        if param.type == "enum" and param.name in ["tiling_width", "tiling_height"]:
+            accessors.append((param.name, int))
+        else:
+            accessors.append((param.name, None))
+    return accessors
+
+def get_model_settings(scene, model):
+    return getattr(scene.neural_render, model.key)
+
+def apply_provider(scene, model):
+    """The model as set up in this scene: on its own provider, or on the server chosen in its settings."""
+    settings = get_model_settings(scene, model)
+    if settings.provider == model.provider and model.provider != LOCAL:
+        return model
+    return replace(model, provider=settings.provider, endpoint=settings.server_url)
+
+def get_parameter_names(model):
+    return [name for name, _ in _accessors[model.name]]
+
+def build_input_params(scene, model):
+    settings = get_model_settings(scene, model)
+    input_params = {}
+    for name, convert in _accessors[model.name]:
+        value = getattr(settings, name)
+        input_params[name] = convert(value) if convert else value
+    return input_params
+
+def register():
+    annotations = {}
+    for model in available_models:
+        group = type(f"NEURALRENDER_PG_{model.key}", (bpy.types.PropertyGroup,), {
+            "__annotations__": {
+                **{
+                    param.name: make_property(param)
+                    for param in model.parameters if param.name not in SKIPPED_PARAMETERS
+                },
+                **make_backend_properties(model),
+            }
+        })
+        bpy.utils.register_class(group)
+        _groups.append(group)
+        _accessors[model.name] = make_accessors(model)
+        annotations[model.key] = bpy.props.PointerProperty(type=group)
+
+    settings = type("NEURALRENDER_PG_settings", (bpy.types.PropertyGroup,), {"__annotations__": annotations})
+    bpy.utils.register_class(settings)
+    _groups.append(settings)
+    bpy.types.Scene.neural_render = bpy.props.PointerProperty(type=settings)
+
+def unregister():
+    del bpy.types.Scene.neural_render
+    for group in reversed(_groups):
+        bpy.utils.unregister_class(group)
+    _groups.clear()
+    _accessors.clear()
@@ -0,0 +1,104 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+
+# Admission control for predictions: priority classes, a per-model concurrency cap and token-bucket
+# rate limits, shared by every job under one API key. No bpy here.
+
+# Priority classes, lowest runs first
+INTERACTIVE = 0  # Process Image, tiles of it
+BATCH = 1  # Frame ranges, command line shards
+BACKGROUND = 2  # Auto-processed renders
+
+DEFAULT_MODEL_LIMIT = 8
+
+class TokenBucket:
+    """Allows rate calls per second on average, in bursts of up to burst calls."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Take one token, sleeping until one is available."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+def backoff(attempt, retry_after=None, base=0.5, cap=30.0):
+    # Retry-After when the server gives one, exponential otherwise; jitter keeps parallel jobs from retrying in step
+    delay = retry_after if retry_after is not None else min(base * 2 ** attempt, cap)
+    return delay * (1.0 + random.random() * 0.25)
+
+class Scheduler:
+    """Runs submitted calls on an executor in priority order, with at most model_limit running per key."""
+
+    def __init__(self, executor, max_workers, model_limit=DEFAULT_MODEL_LIMIT):
+        self.executor = executor
+        self.max_workers = max_workers
+        self.model_limit = model_limit
+        self._queue = []  # (priority, sequence, key, fn, future)
+        self._sequence = itertools.count()  # FIFO within a priority class
+        self._running = Counter()
+        self._lock = threading.Lock()
+
+    def submit(self, fn, priority=INTERACTIVE, key=None):
+        future = Future()
+        with self._lock:
+            heapq.heappush(self._queue, (priority, next(self._sequence), key, fn, future))
+        self._dispatch()
+        return future
+
+    def set_model_limit(self, model_limit):
+        self.model_limit = model_limit
+        self._dispatch()
+
+    def shutdown(self):
+        # Queued calls never start; running ones finish on the executor
+        with self._lock:
+            for entry in self._queue:
+                entry[4].cancel()
+            self._queue.clear()
+
+    def _dispatch(self):
+        with self._lock:
+            waiting = []
+            while self._queue and sum(self._running.values()) < self.max_workers:
+                entry = heapq.heappop(self._queue)
+                priority, sequence, key, fn, future = entry
+                if self._running[key] >= self.model_limit:
+                    waiting.append(entry)  # Its model is at the cap; later entries for other models may still go
+                    continue
+                if not future.set_running_or_notify_cancel():
+                    continue  # Cancelled while queued
+                self._running[key] += 1
+                self.executor.submit(self._run, key, fn, future)
+            for entry in waiting:
+                heapq.heappush(self._queue, entry)
+
+    def _run(self, key, fn, future):
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._running[key] -= 1
+            self._dispatch()
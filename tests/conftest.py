@@ -0,0 +1,45 @@
+import os
+import sys
+import types
+
+import pytest
+
+# The add-on's worker-side modules are bpy-free, so they are tested outside Blender: the package is
+# registered without running its __init__ (which needs bpy), and the benchmark stand-ins serve as backends.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = "neural_render"
+
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+if PACKAGE not in sys.modules:
+    package = types.ModuleType(PACKAGE)
+    package.__path__ = [ROOT]
+    sys.modules[PACKAGE] = package
+
+from mock_inference_server import MockInferenceServer
+from mock_replicate import MockConfig, MockReplicateServer
+
+from neural_render import clients, jobs
+
+@pytest.fixture
+def config():
+    return MockConfig(latency=0.0, inference_time=0.2, bandwidth=0.0, output_size=64 * 1024)
+
+@pytest.fixture
+def replicate_server(config):
+    with MockReplicateServer(config) as server:
+        clients.set_api_url(server.api_url)
+        try:
+            yield server
+        finally:
+            clients.close()
+            jobs.shutdown_executor()
+
+@pytest.fixture
+def inference_server(config):
+    with MockInferenceServer(config) as server:
+        try:
+            yield server
+        finally:
+            clients.close()
+            jobs.shutdown_executor()
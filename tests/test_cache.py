@@ -0,0 +1,46 @@
+import os
+import time
+
+from neural_render.cache import CACHE_FOLDER, ResultCache, hash_bytes, is_deterministic, make_key
+
+def test_key_ignores_parameter_order():
+    assert make_key("abc", "owner/model:1", {"a": 1, "b": 2}) == make_key("abc", "owner/model:1", {"b": 2, "a": 1})
+    assert make_key("abc", "owner/model:1", {"a": 1}) != make_key("abc", "owner/model:2", {"a": 1})
+
+def test_only_fixed_seeds_are_cached():
+    assert is_deterministic({"seed": 42})
+    assert not is_deterministic({"seed": 0})
+    assert not is_deterministic({})
+
+def test_round_trip(tmp_path):
+    cache = ResultCache(str(tmp_path), 1024 * 1024)
+    key = hash_bytes(b"input")
+    assert cache.read(key) is None
+    cache.put_bytes(key, b"output")
+    assert cache.read(key) == b"output"
+    destination = tmp_path / "out" / "render_ai.png"
+    assert cache.fetch(key, str(destination))
+    assert destination.read_bytes() == b"output"
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(str(tmp_path), 2500)
+    keys = [hash_bytes(bytes([index])) for index in range(3)]
+    for index, key in enumerate(keys[:2]):
+        cache.put_bytes(key, b"x" * 1000)
+        os.utime(cache._path(key), (time.time() - 100 + index, time.time() - 100 + index))
+    assert cache.get(keys[0]) is not None  # Touched, so the second entry is now the oldest
+    cache.put_bytes(keys[2], b"x" * 1000)
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[2]) is not None
+
+def test_never_evicts_files_it_did_not_write(tmp_path):
+    beauty = tmp_path / "shot010_beauty.exr"
+    beauty.write_bytes(b"x" * 2000)
+    cache = ResultCache(str(tmp_path), 1000)
+    stray = tmp_path / CACHE_FOLDER / "notes.txt"
+    stray.parent.mkdir()
+    stray.write_bytes(b"x" * 2000)
+    cache.put_bytes(hash_bytes(b"input"), b"x" * 500)
+    assert beauty.exists()
+    assert stray.exists()
@@ -0,0 +1,43 @@
+import pytest
+
+from neural_render import download
+from neural_render.clients import get_session
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(download, "_backoff", lambda attempt: 0)
+
+def fail_first(server, count):
+    # The stand-in drops a CDN download halfway whenever _should_fail says so
+    calls = []
+
+    def should_fail(handler):
+        calls.append(handler.path)
+        return len(calls) <= count
+
+    server.httpd.RequestHandlerClass._should_fail = should_fail
+
+def test_resumes_a_dropped_download_with_range(replicate_server, tmp_path):
+    fail_first(replicate_server, 1)
+    destination = tmp_path / "render_ai.png"
+    progress = []
+    # Small chunks so the bytes that arrived before the drop reach the .part file
+    download.download_file(f"{replicate_server.url}/cdn/0/0.png", str(destination), session=get_session(),
+                           progress=lambda done, total: progress.append((done, total)), chunk_size=4096)
+    assert destination.read_bytes() == replicate_server.payload
+    assert not (tmp_path / "render_ai.png.part").exists()
+    assert replicate_server.requests["injected drop"] == 1
+    # The retry only fetched what was missing
+    size = len(replicate_server.payload)
+    assert replicate_server.bytes_downloaded == size
+    assert progress[-1] == (size, size)
+
+def test_gives_up_after_the_retries(replicate_server, tmp_path):
+    fail_first(replicate_server, 100)
+    destination = tmp_path / "render_ai.png"
+    with pytest.raises(RuntimeError, match="Download failed"):
+        download.download_file(f"{replicate_server.url}/cdn/0/0.png", str(destination), session=get_session(), retries=2)
+    assert not destination.exists()
+
+def test_download_bytes(replicate_server):
+    assert download.download_bytes(f"{replicate_server.url}/cdn/0/0.png", session=get_session()) == replicate_server.payload
@@ -0,0 +1,90 @@
+import socket
+import threading
+
+import pytest
+
+from neural_render import jobstore, predictions
+from neural_render.cache import ResultCache
+from neural_render.jobs import Job, resume_unfinished_jobs
+from neural_render.jobstore import JobStore
+from neural_render.models import available_models
+from neural_render.predictions import JobCancelled
+from mock_replicate import PNG_SIGNATURE
+
+MODEL = available_models[0]
+INPUT = PNG_SIGNATURE + b"input pixels"
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(predictions, "backoff", lambda attempt, retry_after=None: 0.01)
+    monkeypatch.setattr(predictions, "POLL_INITIAL", 0.05)
+
+def params(seed=7):
+    return {parameter.name: parameter.default for parameter in MODEL.parameters} | {"seed": seed}
+
+def test_predicts_and_downloads(replicate_server, tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite"))
+    output_path = str(tmp_path / "render_ai.png")
+    job = Job("key", MODEL, params(), INPUT, output_path, store=store).submit()
+    assert job.result() == output_path
+    assert open(output_path, "rb").read() == replicate_server.payload
+    assert store.get(job.id)["state"] == jobstore.SUCCEEDED
+    assert job.timings.bytes_up == len(INPUT)
+    assert replicate_server.requests["POST /v1/files"] == 1
+
+def test_retries_throttling_and_server_errors(replicate_server, config, tmp_path):
+    config.failure_rate = 0.3
+    jobs = [Job("key", MODEL, params(), INPUT + bytes([index]), str(tmp_path / f"{index}.png")).submit() for index in range(6)]
+    for job in jobs:
+        job.result()
+
+def test_second_run_with_a_fixed_seed_is_a_cache_hit(replicate_server, tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"), 1024 * 1024)
+    Job("key", MODEL, params(), INPUT, str(tmp_path / "first.png"), cache=cache).submit().result()
+    job = Job("key", MODEL, params(), INPUT, str(tmp_path / "second.png"), cache=cache).submit()
+    job.result()
+    assert job.cache_hit
+    assert replicate_server.requests["POST /v1/predictions"] == 1
+
+def test_cancel_stops_the_remote_prediction(replicate_server, config, tmp_path):
+    config.inference_time = 30.0
+    store = JobStore(str(tmp_path / "jobs.sqlite"))
+    job = Job("key", MODEL, params(), INPUT, str(tmp_path / "out.png"), store=store).submit()
+    while job.prediction_id is None:
+        threading.Event().wait(0.01)
+    job.cancel()
+    with pytest.raises(JobCancelled):
+        job.result()
+    assert replicate_server.predictions[job.prediction_id]["canceled"]
+    assert store.get(job.id)["state"] == jobstore.CANCELED
+
+def test_dropped_connection_leaves_the_prediction_resumable(replicate_server, config, tmp_path):
+    config.inference_time = 30.0
+    store = JobStore(str(tmp_path / "jobs.sqlite"))
+    output_path = str(tmp_path / "out.png")
+    job = Job("key", MODEL, params(), INPUT, output_path, store=store).submit()
+    while job.prediction_id is None:
+        threading.Event().wait(0.01)
+
+    def hang_up(handler):
+        handler.close_connection = True
+        handler.connection.shutdown(socket.SHUT_RDWR)
+
+    replicate_server.httpd.RequestHandlerClass.do_GET = hang_up
+    with pytest.raises(Exception) as error:
+        job.result()
+    assert predictions.is_transport_error(error.value)
+    assert store.get(job.id)["state"] == jobstore.RUNNING
+
+def test_resumes_a_stored_prediction(replicate_server, config, tmp_path):
+    config.inference_time = 0.0
+    store = JobStore(str(tmp_path / "jobs.sqlite"))
+    prediction = replicate_server.create_prediction({"version": MODEL.model_id.split(":")[1], "input": {}})
+    output_path = str(tmp_path / "recovered.png")
+    store.add("lost", MODEL.model_id, "hash", {}, {"result": output_path})
+    store.update("lost", prediction_id=prediction["id"], state=jobstore.RUNNING, owner="crashed-host:1", heartbeat=0)
+    futures = resume_unfinished_jobs("key", store, timeout=10)
+    assert len(futures) == 1
+    assert futures[0].result(timeout=10) == [output_path]
+    assert open(output_path, "rb").read() == replicate_server.payload
+    assert store.get("lost")["state"] == jobstore.SUCCEEDED
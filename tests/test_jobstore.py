@@ -0,0 +1,70 @@
+import sqlite3
+import subprocess
+import sys
+import time
+
+import pytest
+
+from neural_render import jobstore
+from neural_render.jobstore import JobStore
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / "jobs.sqlite"))
+
+def add_running(store, job_id="job", **fields):
+    store.add(job_id, "owner/model:1", "hash", {"seed": 1}, {"result": "/out/render_ai.png"}, {"input": {"format": "webp"}})
+    store.update(job_id, **{"prediction_id": "prediction", "state": jobstore.RUNNING, **fields})
+
+def test_round_trip(store):
+    add_running(store)
+    record = store.get("job")
+    assert record["params"] == {"seed": 1}
+    assert record["output_paths"] == {"result": "/out/render_ai.png"}
+    assert record["meta"] == {"input": {"format": "webp"}}
+    assert record["owner"] == jobstore.OWNER
+
+def test_only_started_unfinished_jobs_resume(store):
+    add_running(store, "running")
+    store.add("submitted", "owner/model:1", "hash", {}, {})
+    add_running(store, "done", state=jobstore.SUCCEEDED)
+    assert [record["id"] for record in store.unfinished()] == ["running"]
+
+def test_rows_of_live_processes_are_left_alone(store):
+    add_running(store)
+    process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        store.update("job", owner=f"{jobstore.socket.gethostname()}:{process.pid}", heartbeat=time.time())
+        assert store.unfinished() == []
+    finally:
+        process.kill()
+        process.wait()
+    assert [record["id"] for record in store.unfinished()] == ["job"]
+
+def test_remote_owner_counts_as_gone_once_its_heartbeat_is_stale(store):
+    add_running(store, owner="farm-node-7:1234", heartbeat=time.time())
+    assert store.unfinished() == []
+    store.update("job", heartbeat=time.time() - jobstore.STALE_AFTER - 1)
+    assert [record["id"] for record in store.unfinished()] == ["job"]
+
+def test_only_one_process_claims_a_row(store):
+    add_running(store, owner="farm-node-7:1234", heartbeat=0)
+    record = store.unfinished()[0]
+    assert store.claim("job", record["owner"])
+    assert not store.claim("job", record["owner"])
+    assert store.get("job")["owner"] == jobstore.OWNER
+
+def test_older_stores_gain_the_new_columns(tmp_path):
+    path = str(tmp_path / "jobs.sqlite")
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE jobs (id TEXT PRIMARY KEY, created_at REAL NOT NULL, updated_at REAL NOT NULL, "
+                       "model_id TEXT NOT NULL, input_hash TEXT, params TEXT, prediction_id TEXT, state TEXT NOT NULL, "
+                       "output_paths TEXT, error TEXT)")
+    connection.execute("INSERT INTO jobs VALUES ('old', 0, 0, 'owner/model:1', 'hash', '{}', 'prediction', 'running', '[\"/out.png\"]', NULL)")
+    connection.commit()
+    connection.close()
+    store = JobStore(path)
+    record = store.unfinished()[0]
+    assert record["id"] == "old"
+    assert record["owner"] is None
+    assert record["meta"] == {}
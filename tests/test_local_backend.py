@@ -0,0 +1,81 @@
+import dataclasses
+import threading
+
+import pytest
+
+from neural_render import backends
+from neural_render.backends import LocalBackend, get_backend
+from neural_render.jobs import Job
+from neural_render.jobstore import JobStore
+from neural_render.models import LOCAL, available_models
+from neural_render.predictions import JobCancelled, JobTimeout
+from mock_replicate import PNG_SIGNATURE
+
+INPUT = PNG_SIGNATURE + b"input pixels"
+
+def local_model(server):
+    return dataclasses.replace(available_models[0], provider=LOCAL, endpoint=server.url)
+
+def run(backend, cancel_event=None, timeout=None):
+    prediction = backend.submit(None, {"image": backend.upload(INPUT)[0]})
+    return backend.poll(prediction, cancel_event, timeout)
+
+def test_inputs_and_outputs_travel_inline(inference_server, tmp_path):
+    backend = get_backend(local_model(inference_server))
+    assert isinstance(backend, LocalBackend)
+    url, sent = backend.upload(INPUT)
+    assert url.startswith("data:image/png;base64,")
+    assert sent == len(INPUT)
+
+    prediction = run(backend)
+    assert prediction["status"] == "succeeded"
+    destination = tmp_path / "render_ai.png"
+    backend.fetch(prediction["output"][0], str(destination))
+    assert destination.read_bytes() == backends._decode_data_uri(inference_server.output)
+    assert backend.fetch_bytes(prediction["output"][0]) == destination.read_bytes()
+
+def test_busy_server_is_asked_again(inference_server, monkeypatch):
+    monkeypatch.setattr(backends, "backoff", lambda attempt, base, cap: 0.05)
+    backend = LocalBackend(inference_server.url)
+    results = [None, None]
+
+    def work(index):
+        results[index] = run(backend)
+
+    threads = [threading.Thread(target=work, args=(index,)) for index in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    assert [result["status"] for result in results] == ["succeeded", "succeeded"]
+    assert inference_server.requests["busy 409"] >= 1
+
+def test_cancel_stops_the_server(inference_server, config):
+    config.inference_time = 30.0
+    backend = LocalBackend(inference_server.url)
+    cancel_event = threading.Event()
+    threading.Timer(0.3, cancel_event.set).start()
+    with pytest.raises(JobCancelled):
+        run(backend, cancel_event)
+    assert inference_server.requests["POST /predictions/{id}/cancel"] == 1
+
+def test_timeout_cancels_the_prediction(inference_server, config):
+    config.inference_time = 30.0
+    backend = LocalBackend(inference_server.url)
+    with pytest.raises(JobTimeout):
+        run(backend, timeout=0.5)
+    assert inference_server.requests["POST /predictions/{id}/cancel"] == 1
+
+def test_job_runs_on_the_local_server(inference_server, tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite"))
+    output_path = str(tmp_path / "render_ai.png")
+    job = Job(None, local_model(inference_server), {"seed": 7}, INPUT, output_path, store=store).submit()
+    assert job.result() == output_path
+    assert open(output_path, "rb").read() == backends._decode_data_uri(inference_server.output)
+    # Self-hosted predictions cannot be picked up after a restart, so they are not recorded
+    assert store.get(job.id) is None
+    assert inference_server.requests["PUT /predictions/{id}"] == 1
+
+def test_needs_a_server_url():
+    with pytest.raises(ValueError):
+        LocalBackend("")
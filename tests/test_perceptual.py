@@ -0,0 +1,35 @@
+import numpy as np
+
+from neural_render.perceptual import FrameGroups, dhash, distance
+
+def gradient(width=64, height=48, offset=0.0):
+    x = np.linspace(0.0, 1.0, width, dtype=np.float32)
+    y = np.linspace(0.0, 1.0, height, dtype=np.float32)
+    pixels = np.empty((height, width, 4), dtype=np.float32)
+    pixels[..., :3] = (np.sin(6 * x[None, :] + offset) * np.cos(4 * y[:, None]))[..., None] * 0.5 + 0.5
+    pixels[..., 3] = 1.0
+    return pixels
+
+def test_hash_absorbs_noise_but_not_changes():
+    rng = np.random.default_rng(0)
+    frame = gradient()
+    noisy = frame + rng.normal(0.0, 0.002, frame.shape).astype(np.float32)
+    assert distance(dhash(frame), dhash(noisy)) <= 4
+    assert distance(dhash(frame), dhash(gradient(offset=2.0))) > 32
+
+def test_duplicates_follow_the_first_frame_of_their_group():
+    groups = FrameGroups(threshold=2)
+    assert groups.leader_for(1, 0b0000) is None
+    assert groups.leader_for(2, 0b0001) == 1
+    assert groups.leader_for(3, 0b1111_0000) is None
+    assert groups.leader_for(4, 0b0011) == 1
+    assert groups.followers == {1: [2, 4], 3: []}
+
+def test_a_dropped_leader_releases_its_followers():
+    groups = FrameGroups(threshold=2)
+    groups.leader_for(1, 0)
+    groups.leader_for(2, 0)
+    assert groups.drop(1) == [2]
+    # Later duplicates start a group of their own instead of waiting on the dropped leader
+    assert groups.leader_for(3, 0) is None
+    assert groups.drop(99) == []
@@ -0,0 +1,71 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from neural_render.scheduler import BACKGROUND, BATCH, INTERACTIVE, Scheduler, TokenBucket, backoff
+
+@pytest.fixture
+def executor():
+    executor = ThreadPoolExecutor(max_workers=8)
+    yield executor
+    executor.shutdown(wait=True, cancel_futures=True)
+
+def test_runs_higher_priority_first(executor):
+    scheduler = Scheduler(executor, max_workers=1)
+    release = threading.Event()
+    order = []
+    blocker = scheduler.submit(release.wait, INTERACTIVE, "model")
+    futures = [
+        scheduler.submit(lambda name=name: order.append(name), priority, "model")
+        for name, priority in [("background", BACKGROUND), ("batch", BATCH), ("interactive", INTERACTIVE), ("batch 2", BATCH)]
+    ]
+    release.set()
+    for future in [blocker, *futures]:
+        future.result(timeout=5)
+    assert order == ["interactive", "batch", "batch 2", "background"]
+
+def test_caps_running_calls_per_model(executor):
+    scheduler = Scheduler(executor, max_workers=8, model_limit=2)
+    lock = threading.Lock()
+    running = [0, 0]  # Now, peak
+
+    def work():
+        with lock:
+            running[0] += 1
+            running[1] = max(running[1], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+
+    futures = [scheduler.submit(work, BATCH, "model a") for _ in range(6)]
+    other = scheduler.submit(lambda: "ran", BATCH, "model b")
+    assert other.result(timeout=5) == "ran"  # Not held up by the capped model
+    for future in futures:
+        future.result(timeout=5)
+    assert running[1] == 2
+
+def test_shutdown_cancels_queued_calls(executor):
+    scheduler = Scheduler(executor, max_workers=1)
+    release = threading.Event()
+    running = scheduler.submit(release.wait, INTERACTIVE, "model")
+    queued = scheduler.submit(lambda: None, INTERACTIVE, "model")
+    scheduler.shutdown()
+    release.set()
+    running.result(timeout=5)
+    assert queued.cancelled()
+
+def test_token_bucket_limits_the_rate():
+    bucket = TokenBucket(rate=50.0, burst=5)
+    start = time.monotonic()
+    for _ in range(10):
+        bucket.acquire()
+    # Five come from the burst, the other five at 50 per second
+    assert time.monotonic() - start >= 0.08
+
+def test_backoff_grows_and_honours_retry_after():
+    assert 0.5 <= backoff(0) <= 0.625
+    assert 4.0 <= backoff(3) <= 5.0
+    assert 30.0 <= backoff(20) <= 37.5
+    assert 2.0 <= backoff(0, retry_after=2.0) <= 2.5
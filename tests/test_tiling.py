@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from neural_render.tiling import blend, split, tile_boxes
+
+def image(width, height):
+    rng = np.random.default_rng(1)
+    return rng.random((height, width, 4), dtype=np.float32)
+
+@pytest.mark.parametrize("width, height", [(1000, 700), (512, 512), (300, 2000)])
+def test_boxes_cover_the_image(width, height):
+    boxes = tile_boxes(width, height, 512, 64)
+    covered = np.zeros((height, width), dtype=bool)
+    for x, y, w, h in boxes:
+        assert x + w <= width and y + h <= height
+        covered[y:y + h, x:x + w] = True
+    assert covered.all()
+
+def test_unchanged_tiles_reassemble_the_image():
+    pixels = image(1000, 700)
+    boxes = tile_boxes(1000, 700, 512, 64)
+    result = blend(split(pixels, boxes), boxes, 1000, 700, 1.0, 64)
+    np.testing.assert_allclose(result, pixels, atol=1e-5)
+
+def test_upscaled_tiles_reassemble_at_scale():
+    pixels = image(600, 400)
+    boxes = tile_boxes(600, 400, 256, 32)
+    # Nearest-neighbour 2x upscale of every tile stands in for the model
+    tiles = [tile.repeat(2, axis=0).repeat(2, axis=1) for tile in split(pixels, boxes)]
+    result = blend(tiles, boxes, 600, 400, 2.0, 32)
+    assert result.shape == (800, 1200, 4)
+    np.testing.assert_allclose(result, pixels.repeat(2, axis=0).repeat(2, axis=1), atol=1e-5)
@@ -0,0 +1,64 @@
+import numpy as np
+
+# Splitting and seam-blending of large images. Arrays are (height, width, 4) float32 in Blender's
+# bottom-up row order; nothing here touches bpy.
+
+def tile_starts(length, tile_size, overlap):
+    if length <= tile_size:
+        return [0]
+    step = tile_size - overlap
+    starts = list(range(0, length - tile_size, step))
+    starts.append(length - tile_size)  # Last tile is flush with the far edge
+    return starts
+
+def tile_boxes(width, height, tile_size, overlap):
+    """Return overlapping (x, y, w, h) boxes covering the image."""
+    overlap = min(overlap, tile_size // 2)
+    return [
+        (x, y, min(tile_size, width), min(tile_size, height))
+        for y in tile_starts(height, tile_size, overlap)
+        for x in tile_starts(width, tile_size, overlap)
+    ]
+
+def split(pixels, boxes):
+    return [np.ascontiguousarray(pixels[y:y + h, x:x + w]) for x, y, w, h in boxes]
+
+def _ramp(length, feather, at_start, at_end):
+    ramp = np.ones(length, dtype=np.float32)
+    if feather > 0:
+        edge = (np.arange(feather, dtype=np.float32) + 0.5) / feather
+        if at_start:
+            ramp[:feather] = np.minimum(ramp[:feather], edge)
+        if at_end:
+            ramp[-feather:] = np.minimum(ramp[-feather:], edge[::-1])
+    return ramp
+
+def feather_weights(width, height, feather, left, right, bottom, top):
+    # Only edges shared with a neighbouring tile fade out; image borders keep full weight
+    wx = _ramp(width, min(feather, width // 2), left, right)
+    wy = _ramp(height, min(feather, height // 2), bottom, top)
+    return wy[:, None] * wx[None, :]
+
+def resize_nearest(pixels, width, height):
+    if pixels.shape[0] == height and pixels.shape[1] == width:
+        return pixels
+    rows = (np.arange(height) * pixels.shape[0] / height).astype(np.intp)
+    cols = (np.arange(width) * pixels.shape[1] / width).astype(np.intp)
+    return pixels[rows[:, None], cols[None, :]]
+
+def blend(tiles, boxes, width, height, scale, overlap):
+    """Reassemble processed tiles onto a (height * scale, width * scale) canvas, feathering the overlaps."""
+    out_w, out_h = int(round(width * scale)), int(round(height * scale))
+    accum = np.zeros((out_h, out_w, 4), dtype=np.float32)
+    weight_sum = np.zeros((out_h, out_w, 1), dtype=np.float32)
+    feather = int(round(min(overlap, min(box[2] for box in boxes) // 2) * scale))
+
+    for tile, (x, y, w, h) in zip(tiles, boxes):
+        x0, y0 = int(round(x * scale)), int(round(y * scale))
+        x1, y1 = min(int(round((x + w) * scale)), out_w), min(int(round((y + h) * scale)), out_h)
+        tile = resize_nearest(tile, x1 - x0, y1 - y0)
+        weights = feather_weights(x1 - x0, y1 - y0, feather, x > 0, x + w < width, y > 0, y + h < height)[..., None]
+        accum[y0:y1, x0:x1] += tile * weights
+        weight_sum[y0:y1, x0:x1] += weights
+
+    return accum / np.maximum(weight_sum, 1e-6)
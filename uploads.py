@@ -0,0 +1,87 @@
+import threading
+import time
+from datetime import datetime
+
+from .cache import hash_bytes
+
+REPLICATE_FILES_ENDPOINT = "https://api.replicate.com/v1/files"
+
+# Hosted files are re-uploaded this long before they expire, so a URL never lapses mid-prediction
+EXPIRY_MARGIN = 10 * 60
+
+def guess_content_type(data):
+    if data.startswith(b"\x89PNG"):
+        return "image/png"
+    if data.startswith(b"\xff\xd8"):
+        return "image/jpeg"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    return "application/octet-stream"
+
+class FileUploader:
+    """Uploads each unique image (by content hash) once and remembers its URL until it expires."""
+
+    def __init__(self):
+        self._urls = {}
+        self._lock = threading.Lock()
+
+    def cached_url(self, data):
+        with self._lock:
+            entry = self._urls.get(hash_bytes(data))
+        if entry is not None and entry[1] - EXPIRY_MARGIN > time.time():
+            return entry[0]
+        return None
+
+    def url_for(self, data, filename="input"):
+        url = self.cached_url(data)
+        if url is not None:
+            return url
+
+        url, expires_at = self.upload(data, filename)
+        with self._lock:
+            self._urls[hash_bytes(data)] = (url, expires_at)
+        return url
+
+    def upload(self, data, filename):
+        """Push the bytes to the host and return (url, expires_at as a Unix timestamp)."""
+        raise NotImplementedError
+
+class HTTPFileUploader(FileUploader):
+    """Multipart upload to any endpoint answering with {"url": ...}, e.g. a local stand-in server."""
+
+    field_name = "file"
+
+    def __init__(self, endpoint, headers=None, ttl=24 * 60 * 60, session=None):
+        super().__init__()
+        self.endpoint = endpoint
+        self.headers = headers or {}
+        self.ttl = ttl
+        self.session = session
+
+    def upload(self, data, filename):
+        import requests
+
+        http = self.session or requests
+        files = {self.field_name: (filename, data, guess_content_type(data))}
+        response = http.post(self.endpoint, files=files, headers=self.headers, timeout=120)
+        response.raise_for_status()
+        return self.parse_response(response.json())
+
+    def parse_response(self, payload):
+        return payload["url"], time.time() + self.ttl
+
+class ReplicateFileUploader(HTTPFileUploader):
+    """Replicate Files API: the returned URL can be passed as any file input of a prediction."""
+
+    field_name = "content"
+
+    def __init__(self, api_key, session=None, endpoint=REPLICATE_FILES_ENDPOINT):
+        super().__init__(endpoint, {"Authorization": f"Bearer {api_key}"}, session=session)
+
+    def parse_response(self, payload):
+        expires_at = payload.get("expires_at")
+        if expires_at:
+            expires_at = datetime.fromisoformat(expires_at).timestamp()
+        else:
+            expires_at = time.time() + self.ttl
+        return payload["urls"]["get"], expires_at
@@ -1,14 +1,69 @@
+import os
+
 import bpy
 from bpy.app.handlers import persistent
 
+from .cache import ResultCache
+from .jobstore import JobStore
+from .dependencies import dependencies_available
+from .paths import user_directory
+from .jobs import resume_unfinished_jobs, set_model_limit
+from . import gallery
+from . import profiling
+
+_job_store = None
+
 def get_api_key(preferences):
     return preferences.api_key
 
+def get_result_cache(preferences):
+    if not preferences.use_cache:
+        return None
+    if preferences.cache_directory:
+        directory = bpy.path.abspath(preferences.cache_directory)
+    else:
+        directory = user_directory()
+    return ResultCache(directory, preferences.cache_max_size * 1024 * 1024)
+
+def get_job_store():
+    global _job_store
+    if _job_store is None:
+        _job_store = JobStore(os.path.join(user_directory(), "jobs.sqlite"))
+    return _job_store
+
+def get_job_timeout(preferences):
+    return preferences.job_timeout * 60 if preferences.job_timeout else None
+
+def get_gallery_budget(preferences):
+    return preferences.gallery_memory_budget * 1024 * 1024
+
+def enable_timing_log():
+    # One JSON line per finished job, next to the job store; the path is resolved by the first job to finish
+    profiling.set_log_path(lambda: os.path.join(user_directory(), "timings.jsonl"))
+
+def apply_model_limit():
+    addon = bpy.context.preferences.addons.get(__package__)
+    if addon is not None:
+        set_model_limit(addon.preferences.max_jobs_per_model)
+
+def _report_resumed(future):
+    try:
+        for output_path in future.result():
+            print(f"Neural Render: recovered output saved: {output_path}")
+    except Exception as e:
+        print(f"Neural Render: could not recover prediction: {str(e)}")
+
 @persistent
 def load_handler(dummy):
-    # This function will be called when a new file is loaded
-    # You can use it to set up any necessary environment variables or perform other initialization tasks
-    pass
+    # Pick up predictions that were still running when Blender last closed or crashed
+    preferences = bpy.context.preferences.addons[__package__].preferences
+    gallery.reset_images()
+    apply_model_limit()
+    # A background run would stay alive until the resumed predictions finish
+    if bpy.app.background or not preferences.api_key or not dependencies_available():
+        return
+    for future in resume_unfinished_jobs(preferences.api_key, get_job_store(), get_job_timeout(preferences)):
+        future.add_done_callback(_report_resumed)
 
 def register_handlers():
     bpy.app.handlers.load_post.append(load_handler)